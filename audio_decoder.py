@@ -0,0 +1,124 @@
+import os
+import wave
+import shutil
+import tempfile
+import threading
+import subprocess
+
+from audio_processing import is_wav_file
+from nltk_resources import CACHE_DIR
+from transcript_cache import file_sha256
+
+# Format every recording is normalized to before segmentation and recognition
+TARGET_SAMPLE_RATE = 16000
+
+PCM_CACHE_DIR = os.path.join(CACHE_DIR, 'pcm')
+
+# Formats SpeechRecognition can read without an external decoder
+NATIVE_FORMATS = ('.wav', '.flac', '.aiff', '.aif')
+
+
+class DecodeError(Exception):
+    """A recording could not be converted to PCM"""
+
+
+def is_normalized_wav(path):
+    """True if the file is already a 16 kHz mono 16-bit WAV"""
+    if not is_wav_file(path):
+        return False
+    try:
+        with wave.open(path, 'rb') as wav:
+            return (wav.getframerate() == TARGET_SAMPLE_RATE and wav.getnchannels() == 1
+                    and wav.getsampwidth() == 2)
+    except (wave.Error, EOFError):
+        return False
+
+
+class AudioDecoder:
+    """Converts any accepted upload to 16 kHz mono 16-bit WAV, once per recording.
+
+    Decoding runs in ffmpeg (or avconv) subprocesses, at most `processes` at
+    a time however many jobs ask. Output goes to an on-disk PCM cache keyed
+    by the recording's hash, so later stages and repeat analyses read the
+    same file instead of decoding again; the least recently used files are
+    removed once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir=PCM_CACHE_DIR, max_bytes=1024 * 1024 * 1024, processes=2,
+                 converter=None, timeout=600):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.converter = converter or shutil.which('ffmpeg') or shutil.which('avconv')
+        self._slots = threading.BoundedSemaphore(max(1, processes))
+        self._evict_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_path(self, audio_hash):
+        return os.path.join(self.cache_dir, f"{audio_hash}-{TARGET_SAMPLE_RATE // 1000}k.wav")
+
+    def normalize(self, audio_file, audio_hash=None):
+        """Return the path of a 16 kHz mono WAV with the recording's audio.
+
+        Files already in that format are returned as they are. Without a
+        converter, formats SpeechRecognition reads natively are passed
+        through unchanged; anything else raises DecodeError.
+        """
+        if is_normalized_wav(audio_file):
+            return audio_file
+
+        if self.converter is None:
+            if audio_file.lower().endswith(NATIVE_FORMATS) or is_wav_file(audio_file):
+                return audio_file
+            raise DecodeError("ffmpeg is required to decode MP3, M4A and OGG recordings")
+
+        audio_hash = audio_hash or file_sha256(audio_file)
+        cached = self.cache_path(audio_hash)
+        if os.path.exists(cached):
+            # Mark as recently used for eviction
+            os.utime(cached)
+            print("✅ Using cached decoded audio")
+            return cached
+
+        self._decode(audio_file, cached)
+        self._evict()
+        return cached
+
+    def _decode(self, audio_file, output_path):
+        fd, tmp_path = tempfile.mkstemp(suffix='.wav.tmp', dir=self.cache_dir)
+        os.close(fd)
+        command = [
+            self.converter, '-nostdin', '-hide_banner', '-loglevel', 'error', '-y',
+            '-i', audio_file,
+            '-vn', '-ac', '1', '-ar', str(TARGET_SAMPLE_RATE), '-acodec', 'pcm_s16le', '-f', 'wav',
+            tmp_path
+        ]
+        try:
+            with self._slots:
+                print(f"Decoding {os.path.basename(audio_file)} to {TARGET_SAMPLE_RATE} Hz mono...")
+                process = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                         timeout=self.timeout)
+            if process.returncode != 0:
+                message = process.stderr.decode('utf-8', 'replace').strip().splitlines()
+                raise DecodeError(f"Could not decode audio: {message[-1] if message else 'unknown error'}")
+            os.replace(tmp_path, output_path)
+        except subprocess.TimeoutExpired:
+            raise DecodeError(f"Decoding took longer than {self.timeout} seconds")
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _evict(self):
+        """Remove least recently used decoded files until the cache fits in max_bytes"""
+        with self._evict_lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.wav'):
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                    entries.append((stat.st_mtime, stat.st_size, name))
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                os.remove(os.path.join(self.cache_dir, name))
+                total -= size
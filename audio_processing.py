@@ -0,0 +1,312 @@
+import os
+import wave
+import struct
+import numpy as np
+import speech_recognition as sr
+
+# Audio is read and analysed this many seconds at a time
+BLOCK_SECONDS = 10.0
+
+# Speech threshold = NOISE_THRESHOLD_RATIO x the NOISE_FLOOR_PERCENTILE-th
+# percentile of frame RMS, but never below MIN_ENERGY_THRESHOLD (digital silence)
+NOISE_FLOOR_PERCENTILE = 5
+NOISE_THRESHOLD_RATIO = 3.0
+MIN_ENERGY_THRESHOLD = 50.0
+
+
+def to_mono_int16(raw, sample_width, channels):
+    """Convert interleaved PCM bytes (8/16/24/32-bit) to mono 16-bit samples"""
+    if sample_width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.int32) - 128) << 8
+    elif sample_width == 3:
+        triples = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = (triples[:, 0] | (triples[:, 1] << 8) | (triples[:, 2] << 16)) << 8 >> 16
+    else:
+        dtype = {2: np.int16, 4: np.int32}[sample_width]
+        samples = np.frombuffer(raw, dtype=dtype).astype(np.int32) >> (8 * (sample_width - 2))
+    if channels > 1:
+        # Sum the channels like SpeechRecognition's stereo downmix, so energy
+        # thresholds measured by sr.Recognizer apply unchanged
+        samples = np.clip(samples.reshape(-1, channels).sum(axis=1), -32768, 32767)
+    return samples.astype(np.int16)
+
+
+class PcmAudio:
+    """Mono 16-bit PCM samples plus their sample rate"""
+
+    def __init__(self, samples, sample_rate):
+        self.samples = np.asarray(samples, dtype=np.int16)
+        self.sample_rate = int(sample_rate)
+
+    @classmethod
+    def from_audio_data(cls, audio_data):
+        """Convert an sr.AudioData (already mono) to 16-bit samples"""
+        raw = audio_data.get_raw_data(convert_width=2)
+        return cls(np.frombuffer(raw, dtype=np.int16), audio_data.sample_rate)
+
+    def close(self):
+        """Nothing to release; matches WavSource"""
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+    def slice(self, start, end):
+        """Samples between two times in seconds"""
+        return self.samples[int(start * self.sample_rate):int(end * self.sample_rate)]
+
+    def blocks(self, block_seconds=BLOCK_SECONDS):
+        """Yield the samples in consecutive blocks"""
+        block_length = max(1, int(round(block_seconds * self.sample_rate)))
+        for offset in range(0, len(self.samples), block_length):
+            yield self.samples[offset:offset + block_length]
+
+    def to_audio_data(self, start=0.0, end=None):
+        """sr.AudioData for a time range, ready to send to a recognizer"""
+        end = self.duration if end is None else end
+        return sr.AudioData(self.slice(start, end).tobytes(), self.sample_rate, 2)
+
+
+def is_wav_file(path):
+    """True if the file has a RIFF/WAVE header, whatever its extension"""
+    with open(path, 'rb') as f:
+        header = f.read(12)
+    return header[:4] == b'RIFF' and header[8:12] == b'WAVE'
+
+
+def find_data_chunk(path):
+    """Byte offset and length of the sample data in a RIFF/WAVE file"""
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.seek(12)
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise wave.Error(f"No data chunk in {path}")
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'data':
+                # Streamed writers may leave a placeholder size; trust the file length
+                return f.tell(), min(size, file_size - f.tell())
+            f.seek(size + (size & 1), os.SEEK_CUR)
+
+
+class WavSource:
+    """Mono 16-bit view of a WAV file through a read-only numpy.memmap.
+
+    Same interface as PcmAudio (slice, blocks, to_audio_data). For 16-bit
+    mono files (everything the decoder produces) slices and blocks are
+    zero-copy views of the mapping; other layouts are converted one slice
+    at a time. Pages come from the OS page cache on demand, so private
+    memory does not grow with recording length, and any number of threads
+    can read segments at once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with wave.open(path, 'rb') as wav:
+            self.sample_rate = wav.getframerate()
+            self.sample_width = wav.getsampwidth()
+            self.channels = wav.getnchannels()
+        offset, size = find_data_chunk(path)
+        frame_bytes = self.sample_width * self.channels
+        self.n_frames = size // frame_bytes
+
+        if self.n_frames == 0:
+            self._raw = np.zeros(0, dtype=np.uint8)
+        else:
+            self._raw = np.memmap(path, dtype=np.uint8, mode='r', offset=offset,
+                                  shape=(self.n_frames * frame_bytes,))
+        # Native layout: the mapped bytes already are the samples
+        self.samples = self._raw.view('<i2') if (self.sample_width, self.channels) == (2, 1) else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Drop this object's references to the mapping; it is unmapped once no views remain"""
+        self._raw = self.samples = None
+
+    @property
+    def duration(self):
+        return self.n_frames / self.sample_rate if self.sample_rate else 0.0
+
+    def _frames(self, first, last):
+        if self.samples is not None:
+            return self.samples[first:last]
+        frame_bytes = self.sample_width * self.channels
+        return to_mono_int16(self._raw[first * frame_bytes:last * frame_bytes], self.sample_width, self.channels)
+
+    def slice(self, start, end):
+        """Samples between two times in seconds"""
+        first = min(self.n_frames, int(start * self.sample_rate))
+        last = min(self.n_frames, int(end * self.sample_rate))
+        return self._frames(first, max(first, last))
+
+    def blocks(self, block_seconds=BLOCK_SECONDS):
+        """Yield the samples in consecutive blocks"""
+        block_length = max(1, int(round(block_seconds * self.sample_rate)))
+        for first in range(0, self.n_frames, block_length):
+            yield self._frames(first, min(first + block_length, self.n_frames))
+
+    def to_audio_data(self, start=0.0, end=None):
+        """sr.AudioData for a time range, ready to send to a recognizer"""
+        end = self.duration if end is None else end
+        return sr.AudioData(self.slice(start, end).tobytes(), self.sample_rate, 2)
+
+
+def frame_rms(samples, frame_length):
+    """RMS energy of consecutive non-overlapping frames (a trailing partial frame is dropped)"""
+    n_frames = len(samples) // frame_length
+    if n_frames == 0:
+        return np.zeros(0)
+    frames = samples[:n_frames * frame_length].reshape(n_frames, frame_length).astype(np.float32)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def frame_zcr(samples, frame_length):
+    """Zero-crossing rate (crossings per sample) of consecutive non-overlapping frames"""
+    n_frames = len(samples) // frame_length
+    if n_frames == 0:
+        return np.zeros(0)
+    negative = samples[:n_frames * frame_length].reshape(n_frames, frame_length) < 0
+    return np.count_nonzero(negative[:, 1:] != negative[:, :-1], axis=1) / frame_length
+
+
+def stream_frame_features(pcm, frame_length, block_seconds=BLOCK_SECONDS):
+    """Per-frame (rms, zcr) over a PcmAudio or WavSource, computed one block at a time"""
+    frames_per_block = max(1, int(block_seconds * pcm.sample_rate) // frame_length)
+    rms, zcr = [], []
+    for block in pcm.blocks(frames_per_block * frame_length / pcm.sample_rate):
+        rms.append(frame_rms(block, frame_length))
+        zcr.append(frame_zcr(block, frame_length))
+    if not rms:
+        return np.zeros(0), np.zeros(0)
+    return np.concatenate(rms), np.concatenate(zcr)
+
+
+def noise_floor(rms, percentile=NOISE_FLOOR_PERCENTILE):
+    """Background level of a recording: a low percentile of its frame energies"""
+    return float(np.percentile(rms, percentile)) if len(rms) else 0.0
+
+
+def noise_threshold(rms, ratio=NOISE_THRESHOLD_RATIO):
+    """Speech energy threshold for a recording, from its noise floor.
+
+    If the loud frames are not well above the floor the recording has no
+    real pauses and the "floor" is quiet speech, so only digital silence
+    is gated.
+    """
+    if not len(rms):
+        return MIN_ENERGY_THRESHOLD
+    floor = noise_floor(rms)
+    if np.percentile(rms, 95) < floor * ratio * 2:
+        return MIN_ENERGY_THRESHOLD
+    return max(MIN_ENERGY_THRESHOLD, floor * ratio)
+
+
+def detect_speech(pcm, energy_threshold=None, frame_ms=30, zcr_threshold=0.3):
+    """Voice activity per frame: returns (boolean speech array, frame seconds, energy threshold).
+
+    Voiced speech is loud: RMS above energy_threshold. Unvoiced consonants
+    (s, f, sh) are quieter but cross zero often, so frames above half the
+    threshold with a zero-crossing rate of at least zcr_threshold count too.
+    Without an energy_threshold one is derived from the noise floor of the
+    whole recording, so no audio is set aside for calibration.
+    """
+    frame_length = max(1, int(pcm.sample_rate * frame_ms / 1000))
+    rms, zcr = stream_frame_features(pcm, frame_length)
+    if energy_threshold is None:
+        energy_threshold = noise_threshold(rms)
+    speech = (rms > energy_threshold) | ((rms > energy_threshold / 2) & (zcr >= zcr_threshold))
+    return speech, frame_length / pcm.sample_rate, energy_threshold
+
+
+def speech_coverage(segments, duration):
+    """How much of a recording the segments cover, and how much is skipped"""
+    speech_seconds = sum(end - start for start, end in segments)
+    skipped = max(0.0, duration - speech_seconds)
+    return {
+        'total_seconds': round(duration, 2),
+        'speech_seconds': round(speech_seconds, 2),
+        'skipped_seconds': round(skipped, 2),
+        'skipped_percent': round(100.0 * skipped / duration, 1) if duration else 0.0
+    }
+
+
+# Upper edges (seconds) of the pause-length histogram bins; the last bin is open-ended
+PAUSE_BINS = (0.5, 1.0, 2.0, 5.0)
+
+
+def speech_runs(speech):
+    """Start and end frame indices of each run of speech frames"""
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def pause_statistics(speech, frame_seconds, duration, min_pause=0.25):
+    """Measured timing of a recording from its per-frame voice activity.
+
+    Pauses are silences of at least min_pause seconds between speech;
+    leading and trailing silence are not pauses. Returns total and voiced
+    seconds, pause count/total/mean/longest and a pause-length histogram.
+    """
+    starts, ends = speech_runs(speech)
+    gaps = (starts[1:] - ends[:-1]) * frame_seconds
+    pauses = gaps[gaps >= min_pause]
+    counts, _ = np.histogram(pauses, bins=(min_pause, *PAUSE_BINS, np.inf))
+    return {
+        'total_seconds': round(float(duration), 2),
+        'voiced_seconds': round(float(np.count_nonzero(speech) * frame_seconds), 2),
+        'pause_count': int(len(pauses)),
+        'pause_seconds': round(float(pauses.sum()), 2),
+        'mean_pause': round(float(pauses.mean()), 2) if len(pauses) else 0.0,
+        'longest_pause': round(float(pauses.max()), 2) if len(pauses) else 0.0,
+        'pause_histogram': [
+            {'min_seconds': low, 'max_seconds': high, 'count': int(count)}
+            for low, high, count in zip((min_pause, *PAUSE_BINS), (*PAUSE_BINS, None), counts)
+        ]
+    }
+
+
+def segments_from_speech(speech, frame_seconds, duration, min_silence=0.5,
+                         min_speech=0.3, padding=0.2, max_segment=30.0):
+    """Turn per-frame voice activity into recognizer segments (see split_on_silence)"""
+    if not speech.any():
+        return []
+    starts, ends = speech_runs(speech)
+
+    # Merge runs separated by less than min_silence
+    gap_frames = int(round(min_silence / frame_seconds))
+    keep = np.concatenate(([True], starts[1:] - ends[:-1] >= gap_frames))
+    starts = starts[keep]
+    ends = ends[np.concatenate((keep[1:], [True]))]
+
+    segments = []
+    for start_frame, end_frame in zip(starts, ends):
+        start = max(0.0, start_frame * frame_seconds - padding)
+        end = min(duration, end_frame * frame_seconds + padding)
+        if end_frame - start_frame < min_speech / frame_seconds:
+            continue
+        while end - start > max_segment:
+            segments.append((start, start + max_segment))
+            start += max_segment
+        segments.append((start, end))
+    return segments
+
+
+def split_on_silence(pcm, energy_threshold=None, frame_ms=30, **segment_options):
+    """Split audio (PcmAudio or WavSource) into speech segments at silences.
+
+    Frames are classified by detect_speech (energy_threshold is in the same
+    units as sr.Recognizer.energy_threshold; None estimates it). Speech separated by at least
+    min_silence seconds of silence becomes separate segments; segments are
+    padded, bursts shorter than min_speech are dropped and long segments
+    are cut every max_segment seconds so each recognizer request stays
+    small. Returns a list of (start, end) times in seconds; everything
+    outside them is never sent to the recognizer.
+    """
+    speech, frame_seconds, _ = detect_speech(pcm, energy_threshold, frame_ms)
+    return segments_from_speech(speech, frame_seconds, pcm.duration, **segment_options)
@@ -0,0 +1,1140 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Lecturer Sentiment Analyzer
+
+Usage:
+    python benchmark.py --list
+    python benchmark.py startup [--runs 5]
+    python benchmark.py concurrency [--threads 8]
+    python benchmark.py live [--hours 2]
+    python benchmark.py transcript [--hours 8]
+    python benchmark.py windows [--hours 8]
+    python benchmark.py stream [--clients 100]
+    python benchmark.py metrics
+    python benchmark.py fillers
+    python benchmark.py batch [--docs 2000]
+    python benchmark.py lexicon [--runs 5]
+    python benchmark.py pool [--threads 8] [--docs 2000]
+    python benchmark.py chunked [--minutes 60]
+    python benchmark.py ingest [--minutes 60] [--max-rss-mb 64]
+    python benchmark.py pcm
+    python benchmark.py vad [--minutes 60] [--runs 5]
+    python benchmark.py recognizer [--requests 400] [--threads 8]
+    python benchmark.py http [--requests 400] [--threads 8]
+    python benchmark.py payload [--requests 40] [--uplink-mbps 4]
+    python benchmark.py capture [--threads 8]
+    python benchmark.py replay [--wav lecture.wav] [--speed 10]
+    python benchmark.py cache
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+BENCHMARKS = {}
+
+# Vocabulary for synthetic lecture transcripts: neutral, sentiment-bearing and filler words
+SAMPLE_VOCABULARY = (
+    "today we will learn about machine learning and the data we use to train models "
+    "this is a very interesting and important topic with many great applications "
+    "the results can be bad or really good depending on careful design not luck "
+    "um uh like you know so actually basically literally well okay"
+).split()
+
+
+def benchmark(name):
+    """Register a benchmark function under the given name"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def print_timings(label, timings):
+    """Print min/median/max for a list of timings in seconds"""
+    print(f"{label:<32} min {min(timings) * 1000:9.2f} ms | "
+          f"median {statistics.median(timings) * 1000:9.2f} ms | "
+          f"max {max(timings) * 1000:9.2f} ms")
+
+
+def make_transcript(n_words, seed=0):
+    """Build a reproducible synthetic transcript of roughly n_words words"""
+    rng = random.Random(seed)
+    words = []
+    for i in range(n_words):
+        words.append(rng.choice(SAMPLE_VOCABULARY))
+        if i % 15 == 14:
+            words[-1] += '.'
+    return ' '.join(words)
+
+
+def timed(func):
+    """Run func once and return the elapsed wall-clock time in seconds"""
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+@benchmark('startup')
+def bench_startup(args):
+    """Cold-start latency of importing the analyzer module in a fresh interpreter"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    probe = ("import time; t = time.perf_counter(); "
+             "import lecturer_sentiment_analyzer; "
+             "print(time.perf_counter() - t)")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, LSA_CACHE_DIR=cache_dir)
+
+        def run_once():
+            out = subprocess.run([sys.executable, '-c', probe], cwd=here, env=env,
+                                 capture_output=True, text=True, check=True)
+            return float(out.stdout.strip().splitlines()[-1])
+
+        # First run has no readiness marker and scans nltk_data
+        print_timings("import (no marker)", [run_once()])
+        print_timings("import (marker present)", [run_once() for _ in range(args.runs)])
+
+
+@benchmark('concurrency')
+def bench_concurrency(args):
+    """Analyze distinct transcripts from many threads on one shared engine and check for cross-talk"""
+    from concurrent.futures import ThreadPoolExecutor
+    from lecturer_sentiment_analyzer import SentimentEngine
+
+    engine = SentimentEngine()
+    texts = [make_transcript(300 + 37 * i, seed=i) for i in range(args.threads * 8)]
+
+    started = time.perf_counter()
+    expected = [engine.analyze_text(text) for text in texts]
+    serial_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        actual = list(pool.map(engine.analyze_text, texts))
+    threaded_time = time.perf_counter() - started
+
+    mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+    print(f"{len(texts)} analyses | serial {serial_time:.2f}s | "
+          f"{args.threads} threads {threaded_time:.2f}s | mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+@benchmark('live')
+def bench_live(args):
+    """Per-update cost of live analytics over a simulated session (one chunk every 10s)"""
+    from textblob import TextBlob
+    from lecturer_sentiment_analyzer import SentimentEngine
+    from live_session import LiveSession
+
+    engine = SentimentEngine()
+    n_chunks = int(args.hours * 3600 / 10)
+    chunks = [make_transcript(25, seed=i) for i in range(n_chunks)]
+    session = LiveSession(engine, start_time=0.0)
+    checkpoints = set(range(0, n_chunks, max(1, n_chunks // 6))) | {n_chunks - 1}
+
+    for i, chunk in enumerate(chunks):
+        started = time.perf_counter()
+        session.add_chunk(chunk, now=(i + 1) * 10.0)
+        incremental = time.perf_counter() - started
+
+        if i in checkpoints:
+            # Previous approach: re-score and re-tokenize the whole transcript
+            transcript = " ".join(chunks[:i + 1])
+            started = time.perf_counter()
+            TextBlob(transcript).sentiment
+            words = engine.safe_tokenize(transcript)
+            engine.count_fillers(words)
+            full = time.perf_counter() - started
+            print(f"minute {(i + 1) * 10 / 60:6.1f} | {session.word_count:6d} words | "
+                  f"incremental {incremental * 1000:7.2f} ms | full re-analysis {full * 1000:9.2f} ms")
+
+
+@benchmark('windows')
+def bench_windows(args):
+    """Cost of last-minute / last-5-minute live figures per update: running sums vs rescanning segments"""
+    from lecturer_sentiment_analyzer import SentimentEngine
+    from live_session import LiveSession
+
+    engine = SentimentEngine()
+    n_chunks = int(args.hours * 3600 / 10)
+    # Five minutes of complaints halfway through, which the session average hides
+    bad_stretch = range(n_chunks // 2 - 30, n_chunks // 2)
+    chunks = ["this is bad and boring and the results are terrible and sad" if i in bad_stretch
+              else make_transcript(25, seed=i) for i in range(n_chunks)]
+    session = LiveSession(engine, start_time=0.0)
+    checkpoints = set(range(0, n_chunks, max(1, n_chunks // 6))) | {n_chunks - 1, bad_stretch[-1]}
+
+    def rescan(now, seconds):
+        # Previous shape: recompute a window from every segment of the session
+        recent = [segment for segment in session.segments if segment.end > now - seconds]
+        words = sum(segment.word_count for segment in recent)
+        polarity = sum(segment.polarity * segment.word_count for segment in recent)
+        return words, polarity / words if words else 0.0
+
+    for i, chunk in enumerate(chunks):
+        now = (i + 1) * 10.0
+        session.add_chunk(chunk, now=now)
+        if i not in checkpoints:
+            continue
+        started = time.perf_counter()
+        snapshot = session.snapshot(now)
+        windowed = time.perf_counter() - started
+        started = time.perf_counter()
+        for window in session.windows:
+            rescan(now, window.seconds)
+        rescanned = time.perf_counter() - started
+        recent = snapshot['live_metrics']['windows']['300s']
+        print(f"minute {now / 60:6.1f} | {len(session.segments):5d} segments | snapshot {windowed * 1e6:6.1f} us | "
+              f"rescan {rescanned * 1e6:8.1f} us | polarity session {snapshot['live_sentiment']['polarity']:+.2f}, "
+              f"last 5 min {recent['polarity']:+.2f} ({recent['category']})")
+
+
+@benchmark('transcript')
+def bench_transcript(args):
+    """Time and memory per live update over a long session: growing transcript string vs segment list"""
+    import tracemalloc
+    from lecturer_sentiment_analyzer import SentimentEngine
+    from live_session import LiveSession
+
+    class Holder:
+        live_transcript = ""
+
+    engine = SentimentEngine()
+    n_chunks = int(args.hours * 3600 / 10)
+    chunks = [make_transcript(25, seed=i % 500) for i in range(n_chunks)]
+    window = max(1, n_chunks // 8)
+    legacy, session = Holder(), LiveSession(engine, start_time=0.0)
+
+    tracemalloc.start()
+    for first in range(0, n_chunks, window):
+        batch = range(first, min(first + window, n_chunks))
+        started = time.perf_counter()
+        for i in batch:
+            # Previous approach: the attribute is copied into a new string on every update
+            legacy.live_transcript += " " + chunks[i]
+        concat = (time.perf_counter() - started) / len(batch)
+
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        for i in batch:
+            session.add_chunk(chunks[i], now=(i + 1) * 10.0)
+        update = (time.perf_counter() - started) / len(batch)
+        per_segment = (tracemalloc.get_traced_memory()[0] - before) / len(batch)
+        print(f"hour {batch[-1] * 10 / 3600:5.2f} | string append {concat * 1e6:7.1f} us "
+              f"({len(legacy.live_transcript) / 1024:6.0f} KB string) | segment update {update * 1e6:7.1f} us, "
+              f"{per_segment:5.0f} B retained per segment")
+    tracemalloc.stop()
+
+
+@benchmark('stream')
+def bench_stream(args):
+    """Fan-out of live updates to many stream clients (a tenth of them slow): per-client queues vs coalescing broadcaster"""
+    import json
+    import queue
+    import threading
+    import numpy as np
+    from lecturer_sentiment_analyzer import SentimentEngine
+    from live_session import LiveSession
+    from live_stream import LiveBroadcaster
+
+    # Live snapshots as the analysis loop produces them, published 20 times a second for 10 s
+    engine = SentimentEngine()
+    session = LiveSession(engine, start_time=0.0)
+    snapshots = [session.add_chunk(make_transcript(8, seed=i), now=(i + 1) * 0.5) for i in range(200)]
+    interval, rate = 0.05, 2.0
+
+    def run(subscribe, publish, finish):
+        received = [[0, 0] for _ in range(args.clients)]
+
+        def client(index):
+            # Every tenth client reads one message a second, like a stalled browser tab
+            delay = 1.0 if index % 10 == 0 else 0.0
+            for message in subscribe():
+                received[index][0] += 1
+                received[index][1] += len(message)
+                if delay:
+                    time.sleep(delay)
+
+        threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(args.clients)]
+        for thread in threads:
+            thread.start()
+        publish_times = []
+        cpu_started = time.process_time()
+        for snapshot in snapshots:
+            started = time.perf_counter()
+            publish(snapshot)
+            publish_times.append(time.perf_counter() - started)
+            time.sleep(interval)
+        cpu = time.process_time() - cpu_started
+        backlog = finish()
+        for thread in threads:
+            thread.join(timeout=5)
+        return np.array(publish_times) * 1000, received, cpu, backlog
+
+    # Previous shape: one queue per client, every full snapshot serialized into each
+    queues = [queue.Queue() for _ in range(args.clients)]
+    handed_out = iter(queues)
+
+    def queue_subscribe():
+        client_queue = next(handed_out)
+        while True:
+            message = client_queue.get()
+            if message is None:
+                return
+            yield message
+
+    def queue_publish(snapshot):
+        for client_queue in queues:
+            client_queue.put(f"event: update\ndata: {json.dumps(snapshot)}\n\n")
+
+    def queue_finish():
+        backlog = max(client_queue.qsize() for client_queue in queues)
+        for client_queue in queues:
+            while not client_queue.empty():
+                client_queue.get_nowait()
+            client_queue.put(None)
+        return backlog
+
+    broadcaster = LiveBroadcaster(rate=rate)
+
+    def broadcaster_finish():
+        broadcaster.close()
+        return 0
+
+    print(f"{args.clients} clients, {len(snapshots)} snapshots at {1 / interval:g}/s, stream rate {rate:g}/s per client")
+    for label, subscribe, publish, finish in (
+        ("per-client queues", queue_subscribe, queue_publish, queue_finish),
+        ("coalescing broadcaster", broadcaster.subscribe, broadcaster.publish, broadcaster_finish),
+    ):
+        publish_ms, received, cpu, backlog = run(subscribe, publish, finish)
+        fast = [r for i, r in enumerate(received) if i % 10]
+        slow = [r for i, r in enumerate(received) if not i % 10]
+        print(f"{label:<24} publish p50 {np.percentile(publish_ms, 50):6.3f} ms, p99 {np.percentile(publish_ms, 99):6.3f} ms | "
+              f"CPU {cpu:5.2f}s | fast client {statistics.mean(r[0] for r in fast):5.0f} msgs "
+              f"{statistics.mean(r[1] for r in fast) / 1024:6.1f} KB | slow client {statistics.mean(r[0] for r in slow):4.0f} msgs, "
+              f"backlog {backlog} msgs")
+
+
+def legacy_text_analysis(engine, text):
+    """The pre-fusion path: TextBlob tokenizes for sentiment, then separate passes for each metric"""
+    from textblob import TextBlob
+
+    blob = TextBlob(text)
+    blob.sentiment.polarity, blob.sentiment.subjectivity
+    words = engine.safe_tokenize(text)
+    sum(1 for word in words if word.lower().strip('.,!?') in engine.filler_words)
+    [s.strip() for s in text.split('.') if s.strip()]
+    content_words = [w.lower() for w in words if
+                     w.lower() not in engine.stop_words and w.isalpha() and len(w) > 2]
+    len(set(content_words))
+
+
+@benchmark('metrics')
+def bench_metrics(args):
+    """Fused single-tokenization sentiment + metrics against the previous multi-pass path"""
+    import contextlib
+    import io
+    from lecturer_sentiment_analyzer import SentimentEngine, AnalysisResult
+
+    engine = SentimentEngine()
+    for n_words in (1_000, 10_000, 50_000, 200_000):
+        text = make_transcript(n_words, seed=n_words)
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy = min(timed(lambda: legacy_text_analysis(engine, text)) for _ in range(args.runs))
+            fused = min(timed(lambda: engine.analyze_sentiment(text, AnalysisResult())) for _ in range(args.runs))
+        print(f"{n_words:>7} words | previous {legacy * 1000:9.1f} ms | "
+              f"fused {fused * 1000:9.1f} ms | speedup {legacy / fused:5.2f}x")
+
+
+@benchmark('fillers')
+def bench_fillers(args):
+    """Filler automaton throughput as the lexicon grows, against per-token list lookups"""
+    from filler_matcher import FillerMatcher
+    from lecturer_sentiment_analyzer import DEFAULT_FILLER_WORDS
+
+    rng = random.Random(0)
+    tokens = make_transcript(100_000).lower().split()
+    for size in (10, 100, 1000):
+        # Pad the default lexicon with synthetic one- to three-word regional fillers
+        lexicon = list(DEFAULT_FILLER_WORDS)
+        while len(lexicon) < size:
+            lexicon.append(' '.join(f"filler{rng.randrange(size)}" for _ in range(rng.randint(1, 3))))
+        matcher = FillerMatcher(lexicon)
+
+        automaton = min(timed(lambda: matcher.count(tokens)) for _ in range(args.runs))
+        as_list = list(matcher.phrases)
+        lookup = min(timed(lambda: sum(1 for t in tokens if t.strip('.,!?') in as_list))
+                     for _ in range(args.runs))
+        print(f"{size:>5} phrases | automaton {automaton * 1000:7.1f} ms | "
+              f"list lookup {lookup * 1000:8.1f} ms | matches {matcher.count(tokens)}")
+
+
+@benchmark('batch')
+def bench_batch(args):
+    """Vectorized batch sentiment scoring against per-word pattern scoring and TextBlob, with accuracy"""
+    import contextlib
+    import io
+    from textblob import TextBlob
+    from textblob.en import sentiment as pattern_sentiment
+    from lecturer_sentiment_analyzer import SentimentEngine
+    from sentiment_lexicon import score_batch
+
+    engine = SentimentEngine()
+    texts = [make_transcript(200 + (i % 7) * 150, seed=i) for i in range(args.docs)]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Tokenized once, outside the timed regions, so both lexicon rows time scoring alone
+        token_lists = [engine.safe_tokenize(text) for text in texts]
+
+        started = time.perf_counter()
+        reference = [TextBlob(text).sentiment for text in texts]
+        textblob_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        per_word = [pattern_sentiment(tokens)[:2] for tokens in token_lists]
+        per_word_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        batch_polarity, _ = score_batch(engine.sentiment_lexicon, token_lists)
+        batch_time = time.perf_counter() - started
+
+    words = sum(len(tokens) for tokens in token_lists)
+    for label, elapsed in (("TextBlob(text).sentiment", textblob_time),
+                           ("pattern per-word, tokens", per_word_time),
+                           ("score_batch, tokens", batch_time)):
+        print(f"{label:<26} {elapsed:7.2f}s | {len(texts) / elapsed:9.0f} docs/s | {words / elapsed:11.0f} words/s")
+
+    diff_tokens = max(abs(b - p) for b, (p, _) in zip(batch_polarity, per_word))
+    diff_textblob = max(abs(b - r.polarity) for b, r in zip(batch_polarity, reference))
+    print(f"max |polarity diff| vs per-word scoring: {diff_tokens:.2e} | vs TextBlob(text): {diff_textblob:.2e}")
+
+
+@benchmark('pool')
+def bench_pool(args):
+    """Request-thread text analysis vs offloading to the pre-warmed process pool"""
+    import contextlib
+    import io
+    from concurrent.futures import ThreadPoolExecutor
+    from lecturer_sentiment_analyzer import SentimentEngine
+    from worker_pool import AnalysisPool
+
+    texts = [make_transcript(5000, seed=i) for i in range(max(args.threads, args.docs // 50))]
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = SentimentEngine()
+        pool = AnalysisPool(processes=args.threads, fallback_engine=engine)
+        pool.warm_up()
+        try:
+            for label, analyze in (("request threads (GIL)", engine.analyze_text),
+                                   (f"process pool ({args.threads})", pool.analyze_text)):
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=args.threads) as threads:
+                    list(threads.map(analyze, texts))
+                timings.append((label, time.perf_counter() - started))
+        finally:
+            pool.shutdown()
+
+    print(f"{os.cpu_count()} CPUs available")
+    for label, elapsed in timings:
+        print(f"{label:<24} {len(texts)} x 5000 words in {elapsed:6.2f}s | "
+              f"{len(texts) / elapsed:6.1f} transcripts/s")
+
+
+# Prints load seconds, resident KB delta and private (unshared) KB delta for one load
+LEXICON_PROBE = """
+import os, time
+def memory():
+    with open('/proc/self/statm') as f:
+        _, resident, shared = (int(x) for x in f.read().split()[:3])
+    page_kb = os.sysconf('SC_PAGE_SIZE') // 1024
+    return resident * page_kb, (resident - shared) * page_kb
+{setup}
+rss, private = memory()
+t = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - t
+rss_after, private_after = memory()
+print(elapsed, rss_after - rss, private_after - private)
+"""
+
+
+@benchmark('lexicon')
+def bench_lexicon(args):
+    """Per-worker load time and memory of the sentiment lexicon: TextBlob XML vs compiled mmap (Linux)"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    variants = (
+        ("TextBlob en-sentiment.xml",
+         "from textblob.en import sentiment as pattern_sentiment",
+         "'good' in pattern_sentiment"),
+        ("compiled + mmap",
+         "from sentiment_lexicon import PatternLexicon, COMPILED_LEXICON, load_sentiment_lexicon; "
+         "load_sentiment_lexicon()",
+         "lexicon = PatternLexicon.load(COMPILED_LEXICON); lexicon.polarity.sum()"),
+    )
+    for label, setup, load in variants:
+        samples = []
+        for _ in range(args.runs):
+            probe = LEXICON_PROBE.format(setup=setup, load=load)
+            out = subprocess.run([sys.executable, '-c', probe], cwd=here,
+                                 capture_output=True, text=True, check=True)
+            samples.append([float(x) for x in out.stdout.strip().splitlines()[-1].split()])
+        load_times = [sample[0] for sample in samples]
+        rss = statistics.median(sample[1] for sample in samples)
+        private = statistics.median(sample[2] for sample in samples)
+        print(f"{label:<26} load {statistics.median(load_times) * 1000:8.2f} ms | "
+              f"RSS +{rss:7.0f} KB | private +{private:7.0f} KB")
+
+
+def make_lecture_audio(minutes, sample_rate=16000, seed=0):
+    """Synthetic lecture: 5-15 s noise bursts ("speech") separated by quiet ~0.8 s pauses"""
+    import numpy as np
+    from audio_processing import PcmAudio
+
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * sample_rate)
+    parts, length = [], 0
+    while length < total:
+        speech = rng.normal(0, 2500, int(rng.uniform(5, 15) * sample_rate))
+        pause = rng.normal(0, 40, int(rng.uniform(0.6, 1.0) * sample_rate))
+        parts.extend((speech, pause))
+        length += len(speech) + len(pause)
+    samples = np.clip(np.concatenate(parts)[:total], -32768, 32767).astype(np.int16)
+    return PcmAudio(samples, sample_rate)
+
+
+@benchmark('chunked')
+def bench_chunked(args):
+    """Long-recording transcription wall time by recognizer pool size (fake backend)"""
+    import contextlib
+    import io
+    from audio_processing import split_on_silence
+    from recognizer_backends import FakeRecognizerBackend
+    from transcription import ChunkedTranscriber
+
+    pcm = make_lecture_audio(args.minutes)
+    started = time.perf_counter()
+    segments = split_on_silence(pcm)
+    split_time = time.perf_counter() - started
+    print(f"{args.minutes:g} min of audio -> {len(segments)} segments (split in {split_time * 1000:.0f} ms)")
+
+    # Latency modelled on a remote service: fixed round trip plus time proportional to audio length
+    backend = FakeRecognizerBackend(latency=0.02, latency_per_second=0.002)
+    baseline = None
+    for workers in (1, 2, 4, 8, 16):
+        transcriber = ChunkedTranscriber(backend, workers=workers)
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            transcript, _ = transcriber.transcribe(pcm, segments)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"{workers:>2} workers: {elapsed:6.2f}s | {baseline / elapsed:5.2f}x | "
+              f"{len(transcript.split())} words")
+
+
+def write_lecture_wav(path, minutes, sample_rate=16000, block_minutes=5):
+    """Write a synthetic lecture WAV a few minutes at a time (never whole in memory)"""
+    import wave
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        written, seed = 0.0, 0
+        while written < minutes:
+            block = min(block_minutes, minutes - written)
+            wav.writeframes(make_lecture_audio(block, sample_rate, seed=seed).samples.tobytes())
+            written += block
+            seed += 1
+
+
+# Prints seconds taken and peak growth (KB) of private and file-backed resident
+# memory for one read or transcription, measured in a fresh process
+INGEST_PROBE = """
+import os, sys, time, threading, contextlib, io
+from lecturer_sentiment_analyzer import SentimentEngine
+from recognizer_backends import FakeRecognizerBackend
+import speech_recognition as sr
+
+def memory_kb():
+    with open('/proc/self/statm') as f:
+        _, resident, shared = (int(x) for x in f.read().split()[:3])
+    page_kb = os.sysconf('SC_PAGE_SIZE') // 1024
+    return (resident - shared) * page_kb, shared * page_kb
+
+# ru_maxrss would include the import-time peak, so sample memory while the work runs
+peak = [0, 0]
+done = threading.Event()
+def sample():
+    while not done.wait(0.002):
+        peak[:] = map(max, peak, memory_kb())
+
+with contextlib.redirect_stdout(io.StringIO()):
+    engine = SentimentEngine(recognizer_backend=FakeRecognizerBackend())
+    baseline = memory_kb()
+    peak[:] = baseline
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    started = time.perf_counter()
+    if {legacy}:
+        with sr.AudioFile({path!r}) as source:
+            sr.Recognizer().record(source)
+    else:
+        results = {{}}
+        engine.transcribe_audio({path!r}, results)
+        assert results.get('segments'), results['transcript']
+    elapsed = time.perf_counter() - started
+    done.set()
+    sampler.join()
+peak[:] = map(max, peak, memory_kb())
+print(elapsed, peak[0] - baseline[0], peak[1] - baseline[1])
+"""
+
+
+def run_ingest_probe(path, legacy):
+    """(seconds, private MB, file-backed MB) for reading or transcribing one file"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    probe = INGEST_PROBE.format(legacy=legacy, path=path)
+    out = subprocess.run([sys.executable, '-c', probe], cwd=here,
+                         capture_output=True, text=True, check=True)
+    elapsed, private, file_backed = (float(x) for x in out.stdout.strip().splitlines()[-1].split())
+    return elapsed, private / 1024, file_backed / 1024
+
+
+@benchmark('ingest')
+def bench_ingest(args):
+    """Peak private memory of transcribing a recording: whole-file AudioData vs streamed WAV reading"""
+    failed = False
+    with tempfile.TemporaryDirectory() as workdir:
+        for minutes in (args.minutes / 6, args.minutes / 2, args.minutes):
+            path = os.path.join(workdir, f"lecture_{minutes:g}min.wav")
+            write_lecture_wav(path, minutes)
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            _, whole_file, _ = run_ingest_probe(path, legacy=True)
+            _, streamed, _ = run_ingest_probe(path, legacy=False)
+            print(f"{minutes:6g} min ({size_mb:6.1f} MB): whole-file read +{whole_file:7.1f} MB | "
+                  f"streamed transcription +{streamed:6.1f} MB")
+            failed = failed or streamed > args.max_rss_mb
+            os.remove(path)
+
+    if failed:
+        print(f"❌ Streamed transcription exceeded the {args.max_rss_mb} MB RSS ceiling")
+        sys.exit(1)
+    print(f"✅ Streamed transcription stayed under {args.max_rss_mb} MB at every length")
+
+
+@benchmark('pcm')
+def bench_pcm(args):
+    """Memory and time of transcribing memory-mapped 10 min / 1 h / 3 h recordings (fake backend)"""
+    print("File-backed pages are shared page cache the kernel can drop; private memory is the worker's own")
+    with tempfile.TemporaryDirectory() as workdir:
+        for minutes in (10, 60, 180):
+            path = os.path.join(workdir, f"lecture_{minutes}min.wav")
+            write_lecture_wav(path, minutes)
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            elapsed, private, file_backed = run_ingest_probe(path, legacy=False)
+            print(f"{minutes:4d} min ({size_mb:6.1f} MB): {elapsed:6.2f}s (RTF {elapsed / (minutes * 60):.4f}) | "
+                  f"private +{private:6.1f} MB | file-backed +{file_backed:6.1f} MB")
+            os.remove(path)
+
+
+@benchmark('vad')
+def bench_vad(args):
+    """Voice-activity detection speed (real-time factor), share of audio skipped and pause statistics cost"""
+    from audio_processing import WavSource, detect_speech, split_on_silence, speech_coverage, pause_statistics
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'lecture.wav')
+        write_lecture_wav(path, args.minutes)
+        with WavSource(path) as audio:
+            timings = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                segments = split_on_silence(audio)
+                timings.append(time.perf_counter() - started)
+            speech, frame_seconds, _ = detect_speech(audio)
+            coverage = speech_coverage(segments, audio.duration)
+            started = time.perf_counter()
+            acoustics = pause_statistics(speech, frame_seconds, audio.duration)
+            pause_time = time.perf_counter() - started
+
+    elapsed = statistics.median(timings)
+    print(f"{args.minutes:g} min recording: VAD + segmentation {elapsed * 1000:.0f} ms | "
+          f"RTF {elapsed / (args.minutes * 60):.6f}")
+    print(f"speech frames {speech.mean() * 100:.1f}% | sent to recognizer {coverage['speech_seconds']:.0f}s "
+          f"of {coverage['total_seconds']:.0f}s | skipped {coverage['skipped_percent']}%")
+    print(f"pause statistics {pause_time * 1000:.1f} ms on top of VAD | {acoustics['pause_count']} pauses, "
+          f"voiced {acoustics['voiced_seconds']:.0f}s")
+
+
+@benchmark('recognizer')
+def bench_recognizer(args):
+    """Throughput, tail latency and success rate against a flaky fake recognizer, with and without ResilientBackend"""
+    import contextlib
+    import io
+    import numpy as np
+    import speech_recognition as sr
+    from concurrent.futures import ThreadPoolExecutor
+    from recognizer_backends import FakeRecognizerBackend, ResilientBackend
+
+    rng = np.random.default_rng(0)
+    clips = [sr.AudioData(rng.normal(0, 2000, int(rng.uniform(5, 10) * 16000)).astype(np.int16).tobytes(), 16000, 2)
+             for _ in range(args.requests)]
+    # 50 ms round trip + 5 ms per audio second, 3% of calls stall 1.5 s, 5% fail outright
+    profile = dict(latency=0.05, latency_per_second=0.005, jitter=0.05,
+                   tail_probability=0.03, tail_latency=1.5, failure_rate=0.05)
+    variants = (
+        ("bare backend", lambda: FakeRecognizerBackend(**profile)),
+        ("retries, no timeout", lambda: ResilientBackend(FakeRecognizerBackend(**profile), timeout=None,
+                                                         backoff=0.05, failure_threshold=1000)),
+        ("retries + 0.4s timeout", lambda: ResilientBackend(FakeRecognizerBackend(**profile), timeout=0.4,
+                                                            backoff=0.05, failure_threshold=1000)),
+    )
+
+    def call(backend, clip):
+        started = time.perf_counter()
+        try:
+            backend.recognize(clip)
+            ok = True
+        except sr.RequestError:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    print(f"{args.requests} requests, {args.threads} threads")
+    for label, make in variants:
+        backend = make()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(max_workers=args.threads) as pool:
+            outcomes = list(pool.map(lambda clip: call(backend, clip), clips))
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency for latency, _ in outcomes)
+        p50, p95, p99 = (latencies[min(len(latencies) - 1, int(q * len(latencies)))] for q in (0.5, 0.95, 0.99))
+        succeeded = sum(ok for _, ok in outcomes)
+        print(f"{label:<24} {len(clips) / elapsed:6.1f} req/s | p50 {p50 * 1000:5.0f} ms | "
+              f"p95 {p95 * 1000:5.0f} ms | p99 {p99 * 1000:5.0f} ms | ok {100 * succeeded / len(clips):5.1f}%")
+
+
+# Body of a successful Web Speech API response
+STANDIN_RESPONSE = (b'{"result":[]}\n'
+                    b'{"result":[{"alternative":[{"transcript":"hello class"}],"final":true}],"result_index":0}\n')
+
+
+def start_speech_standin(quota=None, uplink_mbps=None):
+    """Local HTTP/1.1 stand-in for the Web Speech API that counts connections.
+
+    With quota set, requests beyond quota per second are refused with 429
+    like a provider enforcing its rate limit. With uplink_mbps set, each
+    request body takes as long to arrive as it would over a link of that
+    speed. Returns (server, stats).
+    """
+    import collections
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    stats = {'connections': 0, 'requests': 0, 'throttled': 0, 'bytes': 0}
+    lock = threading.Lock()
+    recent = collections.deque()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            with lock:
+                stats['connections'] += 1
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers['Content-Length']))
+            if uplink_mbps:
+                time.sleep(len(body) * 8 / (uplink_mbps * 1e6))
+            now = time.monotonic()
+            with lock:
+                stats['requests'] += 1
+                stats['bytes'] += len(body)
+                while recent and now - recent[0] > 1.0:
+                    recent.popleft()
+                throttled = quota is not None and len(recent) >= quota
+                if throttled:
+                    stats['throttled'] += 1
+                else:
+                    recent.append(now)
+            status, payload = (429, b'quota exceeded') if throttled else (200, STANDIN_RESPONSE)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+@benchmark('http')
+def bench_http(args):
+    """Connections opened and quota errors against a local Web Speech stand-in: per-call vs pooled, with rate limiting"""
+    import urllib.request
+    import numpy as np
+    import speech_recognition as sr
+    from concurrent.futures import ThreadPoolExecutor
+    from recognizer_backends import GoogleRecognizerBackend
+
+    rng = np.random.default_rng(0)
+    clip = sr.AudioData(rng.normal(0, 2000, 2 * 16000).astype(np.int16).tobytes(), 16000, 2)
+    flac_data = clip.get_flac_data()
+    quota = 40
+
+    def per_call(endpoint):
+        # What recognize_google does: a fresh urllib connection for every request
+        def recognize(_):
+            request = urllib.request.Request(endpoint, data=flac_data,
+                                             headers={'Content-Type': 'audio/x-flac; rate=16000'})
+            try:
+                urllib.request.urlopen(request, timeout=10).read()
+            except urllib.error.HTTPError:
+                pass
+        return recognize
+
+    def pooled(endpoint, **options):
+        backend = GoogleRecognizerBackend(endpoint=endpoint, **options)
+
+        def recognize(_):
+            try:
+                backend.recognize(clip, timeout=10)
+            except sr.RequestError:
+                pass
+        return recognize
+
+    variants = (
+        ("new connection per call", lambda endpoint: per_call(endpoint)),
+        ("pooled keep-alive", lambda endpoint: pooled(endpoint)),
+        (f"pooled + {quota}/s token bucket", lambda endpoint: pooled(endpoint, rate_limit=quota * 0.95, burst=1)),
+    )
+    print(f"{args.requests} requests, {args.threads} threads, stand-in quota {quota} requests/s")
+    for label, make in variants:
+        server, stats = start_speech_standin(quota=quota)
+        recognize = make(f"http://127.0.0.1:{server.server_port}/speech-api/v2/recognize")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            list(pool.map(recognize, range(args.requests)))
+        elapsed = time.perf_counter() - started
+        server.shutdown()
+        print(f"{label:<28} {elapsed:6.2f}s | {stats['connections']:4d} connections | "
+              f"{stats['throttled']:4d} refused by quota (429)")
+
+
+def make_voiced_clip(seconds, sample_rate, seed=0):
+    """Speech-like test signal: a harmonic voice with a wandering pitch and syllable envelope, plus room noise"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = rng.uniform(110, 220) * (1 + 0.1 * np.sin(2 * np.pi * 0.7 * t))
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 30) if k * pitch.max() < sample_rate / 2)
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t + rng.uniform(0, 6)), 0, None)
+    samples = 6000 * voice * envelope + rng.normal(0, 60, len(t))
+    return np.clip(samples, -32768, 32767).astype(np.int16)
+
+
+@benchmark('payload')
+def bench_payload(args):
+    """Bytes on the wire and request latency per 5 s segment: raw 44.1 kHz stereo vs 16 kHz mono FLAC"""
+    import numpy as np
+    import speech_recognition as sr
+    from http_pool import ConnectionPool
+    from recognizer_backends import GoogleRecognizerBackend
+
+    n_requests = min(args.requests, 40)
+    rate = 44100
+    clips = []
+    for seed in range(n_requests):
+        mono = make_voiced_clip(5.0, rate, seed)
+        stereo = np.repeat(mono[:, None], 2, axis=1).ravel()
+        clips.append((stereo.tobytes(), sr.AudioData(mono.tobytes(), rate, 2)))
+
+    def raw_pcm(endpoint):
+        # The upload as it arrived: 16-bit stereo PCM at the recording's rate
+        base, path = endpoint.split('/speech-api', 1)
+        pool = ConnectionPool(base)
+        headers = {'Content-Type': f"audio/l16; rate={rate}; channels=2"}
+        return lambda stereo, audio_data: pool.request('POST', '/speech-api' + path, body=stereo,
+                                                       headers=headers, timeout=30)
+
+    def flac(**options):
+        def make(endpoint):
+            backend = GoogleRecognizerBackend(endpoint=endpoint, **options)
+            return lambda stereo, audio_data: backend.recognize(audio_data, timeout=30)
+        return make
+
+    variants = (
+        ("raw 44.1 kHz stereo PCM", raw_pcm),
+        ("FLAC 44.1 kHz mono", flac(sample_rate=None)),
+        ("FLAC 16 kHz mono", flac()),
+    )
+    print(f"{n_requests} requests of 5 s audio, one at a time, {args.uplink_mbps:g} Mbit/s uplink to the stand-in")
+    for label, make in variants:
+        server, stats = start_speech_standin(uplink_mbps=args.uplink_mbps)
+        recognize = make(f"http://127.0.0.1:{server.server_port}/speech-api/v2/recognize")
+        latencies = []
+        for stereo, audio_data in clips:
+            started = time.perf_counter()
+            recognize(stereo, audio_data)
+            latencies.append(time.perf_counter() - started)
+        server.shutdown()
+        print(f"{label:<24} {stats['bytes'] / stats['requests'] / 1024:7.1f} KB/request | "
+              f"latency mean {statistics.mean(latencies) * 1000:6.0f} ms, "
+              f"p95 {np.percentile(latencies, 95) * 1000:6.0f} ms")
+
+
+def make_synthetic_microphone(pcm, speed=1.0, buffer_seconds=0.5, chunk=1024):
+    """A microphone that plays `pcm` in real time (times speed).
+
+    Like a sound card it keeps only buffer_seconds of unread audio: frames
+    not read in time are dropped and counted in dropped_frames. Reads
+    return b'' once the recording has been played.
+    """
+    import speech_recognition as sr
+
+    class SyntheticMicrophone(sr.AudioSource):
+        CHUNK = chunk
+        SAMPLE_RATE = pcm.sample_rate
+        SAMPLE_WIDTH = 2
+
+        def __init__(self):
+            self.stream = self
+            self.position = 0
+            self.dropped_frames = 0
+            self.started = None
+            self.rate = pcm.sample_rate * speed
+
+        def __enter__(self):
+            if self.started is None:
+                self.started = time.monotonic()
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def read(self, frames):
+            while True:
+                available = min(len(pcm.samples), int((time.monotonic() - self.started) * self.rate))
+                overflow = available - self.position - int(buffer_seconds * pcm.sample_rate)
+                if overflow > 0:
+                    self.dropped_frames += overflow
+                    self.position += overflow
+                if available >= min(self.position + frames, len(pcm.samples)):
+                    break
+                time.sleep((self.position + frames - available) / self.rate)
+            data = pcm.samples[self.position:self.position + frames]
+            self.position += len(data)
+            return data.tobytes()
+
+    return SyntheticMicrophone()
+
+
+@benchmark('capture')
+def bench_capture(args):
+    """Frames dropped in live mode with a slow recognizer: listen-then-recognize loop vs capture thread + workers"""
+    import speech_recognition as sr
+    from recognizer_backends import FakeRecognizerBackend
+    from live_capture import LiveCapture
+
+    # 3 minutes of lecture played 10x faster than real time; the recognizer
+    # takes 1 s + 0.1 s per audio second in lecture time
+    speed, minutes = 10.0, 3
+    pcm = make_lecture_audio(minutes)
+    make_backend = lambda: FakeRecognizerBackend(latency=1.0 / speed, latency_per_second=0.1 / speed, seed=1)
+    total = len(pcm.samples)
+
+    # Previous loop: nothing is captured while a phrase is being recognized
+    microphone, backend = make_synthetic_microphone(pcm, speed), make_backend()
+    recognizer = sr.Recognizer()
+    recognizer.energy_threshold, recognizer.dynamic_energy_threshold = 300, False
+    phrases = 0
+    with microphone as source:
+        while source.position < total:
+            try:
+                audio_data = recognizer.listen(source, timeout=1, phrase_time_limit=10)
+            except sr.WaitTimeoutError:
+                continue
+            if not audio_data.frame_data:
+                break
+            try:
+                backend.recognize(audio_data)
+                phrases += 1
+            except sr.UnknownValueError:
+                pass
+    print(f"listen-then-recognize      {microphone.dropped_frames / total * 100:5.1f}% of frames dropped "
+          f"({microphone.dropped_frames / pcm.sample_rate:5.1f}s of {minutes * 60}s) | {phrases} phrases")
+
+    microphone = make_synthetic_microphone(pcm, speed)
+    results = []
+    with microphone as source:
+        capture = LiveCapture(source, make_backend(), lambda text, start, end: results.append(start),
+                              energy_threshold=300, workers=args.threads)
+        capture.start()
+        capture.wait()
+        capture.stop()
+    in_order = results == sorted(results)
+    print(f"capture thread + {args.threads} workers {microphone.dropped_frames / total * 100:5.1f}% of frames dropped "
+          f"({microphone.dropped_frames / pcm.sample_rate:5.1f}s of {minutes * 60}s) | {len(results)} phrases | "
+          f"{capture.frames_captured} of {total} frames captured | results in order: {in_order}")
+
+    if microphone.dropped_frames or capture.frames_captured != total or capture.ring.overruns or not in_order:
+        print("❌ Decoupled capture lost audio or reordered results")
+        sys.exit(1)
+    print("✅ No frames dropped and results merged in time order")
+
+
+@benchmark('replay')
+def bench_replay(args):
+    """Replay a WAV as timed 1 s chunks through the ingest API: report delay after the last chunk vs uploading the file"""
+    import io
+    import wave
+    import numpy as np
+
+    workdir = tempfile.mkdtemp()
+    os.environ.setdefault('RECOGNIZER_BACKEND', 'fake')
+    os.environ.setdefault('ANALYSIS_PROCESSES', '0')
+    os.environ.setdefault('TRANSCRIPT_CACHE_MB', '0')
+    os.environ.setdefault('JOB_DATABASE', os.path.join(workdir, 'jobs.sqlite3'))
+    import main
+    from recognizer_backends import FakeRecognizerBackend
+
+    # A recognizer with a realistic round trip, shared by both paths
+    backend = FakeRecognizerBackend(latency=0.3, latency_per_second=0.05, seed=1)
+    main.analyzer.recognizer_backend = main.analyzer.transcriber.backend = backend
+    client = main.app.test_client()
+
+    path = args.wav
+    if path is None:
+        path = os.path.join(workdir, 'lecture.wav')
+        write_lecture_wav(path, 5)
+    with wave.open(path, 'rb') as wav:
+        rate, width, channels = wav.getframerate(), wav.getsampwidth(), wav.getnchannels()
+        frames = wav.readframes(wav.getnframes())
+    chunk_bytes = rate * width * channels
+    duration = len(frames) / chunk_bytes
+    print(f"{os.path.basename(path)}: {duration / 60:.1f} min at {rate} Hz, replayed at {args.speed:g}x as 1 s WAV chunks")
+
+    session = client.post(f'/api/ingest?rate={rate}').get_json()
+    started = time.perf_counter()
+    for sequence, offset in enumerate(range(0, len(frames), chunk_bytes)):
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as chunk:
+            chunk.setnchannels(channels)
+            chunk.setsampwidth(width)
+            chunk.setframerate(rate)
+            chunk.writeframes(frames[offset:offset + chunk_bytes])
+        response = client.post(f"{session['chunk_url']}?seq={sequence}", data=buffer.getvalue(),
+                               content_type='audio/wav')
+        assert response.status_code == 202, response.get_json()
+        # Send on the lecture's own clock (sped up)
+        delay = started + (sequence + 1) / args.speed - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    last_chunk = time.perf_counter()
+    finished = client.post(session['finish_url']).get_json()
+    ingest_delay = time.perf_counter() - last_chunk
+    words = finished['result']['metrics']['word_count']
+
+    # Previous flow: upload the whole recording once the lecture has ended
+    started = time.perf_counter()
+    with open(path, 'rb') as f:
+        job = client.post('/api/analyze', data={'audio': (f, 'lecture.wav')},
+                          content_type='multipart/form-data').get_json()
+    while True:
+        status = client.get(job['status_url']).get_json()
+        if status['status'] in ('done', 'failed'):
+            break
+        time.sleep(0.05)
+    upload_delay = time.perf_counter() - started
+
+    print(f"upload after the lecture   report {upload_delay:6.2f}s after the end | "
+          f"{status['result']['metrics']['word_count']} words")
+    print(f"chunked ingest             report {ingest_delay:6.2f}s after the last chunk | {words} words | "
+          f"{finished['result']['ingest']['chunks']} chunks")
+
+
+@benchmark('cache')
+def bench_cache(args):
+    """Transcript cache with a flaky recognizer: results with failed segment requests must not be cached"""
+    workdir = tempfile.mkdtemp()
+    os.environ['RECOGNIZER_BACKEND'] = 'fake'
+    os.environ['TRANSCRIPT_CACHE'] = os.path.join(workdir, 'transcripts.sqlite3')
+    os.environ['TRANSCRIPT_CACHE_MB'] = '64'
+    os.environ.setdefault('ANALYSIS_PROCESSES', '0')
+    os.environ.setdefault('JOB_DATABASE', os.path.join(workdir, 'jobs.sqlite3'))
+    import main
+    from recognizer_backends import FakeRecognizerBackend
+
+    client = main.app.test_client()
+    path = os.path.join(workdir, 'lecture.wav')
+    write_lecture_wav(path, 2)
+
+    def upload():
+        with open(path, 'rb') as f:
+            response = client.post('/api/analyze', data={'audio': (f, 'lecture.wav')},
+                                   content_type='multipart/form-data')
+        status_url = response.get_json()['status_url']
+        while True:
+            job = client.get(status_url).get_json()
+            if job['status'] in ('done', 'failed'):
+                break
+            time.sleep(0.05)
+        return response.status_code == 200, job
+
+    ok = True
+    for label, failure_rate in (("flaky (50% failures)", 0.5), ("healthy", 0.0)):
+        backend = FakeRecognizerBackend(failure_rate=failure_rate, seed=3)
+        main.analyzer.recognizer_backend = main.analyzer.transcriber.backend = backend
+        _, job = upload()
+        failed = len(main.failed_requests(job['result'].get('segments', []))) if job['result'] else 0
+        cached, _ = upload()
+        print(f"{label:<22} {failed:3d} failed segment requests | re-upload served from cache: {cached}")
+        ok = ok and cached == (failed == 0)
+
+    if not ok:
+        print("❌ Results with failed recognition requests were cached, or complete results were not")
+        sys.exit(1)
+    print("✅ Only complete transcriptions were cached")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run analyzer benchmarks")
+    parser.add_argument('name', nargs='?', help="Benchmark to run")
+    parser.add_argument('--list', action='store_true', help="List available benchmarks")
+    parser.add_argument('--runs', type=int, default=5, help="Repetitions per measurement")
+    parser.add_argument('--threads', type=int, default=8, help="Worker threads for concurrent benchmarks")
+    parser.add_argument('--docs', type=int, default=2000, help="Transcripts per batch benchmark")
+    parser.add_argument('--hours', type=float, default=2.0, help="Simulated live session length")
+    parser.add_argument('--requests', type=int, default=400, help="Recognizer requests per benchmark")
+    parser.add_argument('--minutes', type=float, default=60.0, help="Synthetic recording length")
+    parser.add_argument('--wav', help="Recording to replay (default: a synthetic 5 minute lecture)")
+    parser.add_argument('--speed', type=float, default=10.0, help="Replay speed relative to real time")
+    parser.add_argument('--clients', type=int, default=100, help="Live stream subscribers")
+    parser.add_argument('--uplink-mbps', type=float, default=4.0, help="Simulated uplink speed for the payload benchmark")
+    parser.add_argument('--max-rss-mb', type=float, default=64.0, help="Peak memory ceiling for streamed ingestion")
+    args = parser.parse_args()
+
+    if args.list or not args.name:
+        for name, func in BENCHMARKS.items():
+            print(f"{name:<16} {func.__doc__}")
+        sys.exit(0)
+
+    if args.name not in BENCHMARKS:
+        parser.error(f"Unknown benchmark: {args.name}")
+
+    print(f"Running benchmark: {args.name}")
+    started = time.perf_counter()
+    BENCHMARKS[args.name](args)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
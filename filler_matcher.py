@@ -0,0 +1,98 @@
+from collections import deque
+
+
+def load_filler_lexicon(path):
+    """Read a filler lexicon file: one phrase per line, '#' starts a comment"""
+    phrases = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            phrase = line.split('#', 1)[0].strip().lower()
+            if phrase:
+                phrases.append(phrase)
+    return phrases
+
+
+class FillerMatcher:
+    """Aho-Corasick automaton over tokens for single- and multi-word filler phrases.
+
+    Phrases are split on whitespace into token sequences ("you know" ->
+    ("you", "know")). Matching walks the token stream once, so the cost is
+    O(number of tokens) however many phrases the lexicon holds.
+
+    Transitions are stored as a dict per state holding only the edges that
+    differ from the root's edges. Tokens outside the lexicon fall straight
+    back to the root, so even large lexicons keep the tables small.
+    """
+
+    ROOT = 0
+
+    def __init__(self, phrases):
+        self.phrases = frozenset(' '.join(p.lower().split()) for p in phrases if p.strip())
+
+        goto = [{}]
+        match_counts = [0]
+        for phrase in self.phrases:
+            state = self.ROOT
+            for token in phrase.split():
+                if token not in goto[state]:
+                    goto.append({})
+                    match_counts.append(0)
+                    goto[state][token] = len(goto) - 1
+                state = goto[state][token]
+            match_counts[state] += 1
+
+        # Breadth-first pass: failure links, inherited match counts and the
+        # resolved transitions of each state's failure chain
+        fail = [self.ROOT] * len(goto)
+        transitions = [{} for _ in goto]
+        root_transitions = goto[self.ROOT]
+        queue = deque(goto[self.ROOT].values())
+
+        while queue:
+            state = queue.popleft()
+            # Resolved edges of the failure state that differ from the root's,
+            # overlaid with this state's own edges
+            resolved = dict(transitions[fail[state]])
+            resolved.update(goto[state])
+            transitions[state] = {token: nxt for token, nxt in resolved.items()
+                                  if root_transitions.get(token) != nxt}
+
+            for token, child in goto[state].items():
+                fallback = fail[state]
+                while fallback != self.ROOT and token not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(token, self.ROOT)
+                match_counts[child] += match_counts[fail[child]]
+                queue.append(child)
+
+        self.root_transitions = root_transitions
+        self.transitions = transitions
+        self.match_counts = match_counts
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def __contains__(self, phrase):
+        return ' '.join(phrase.lower().split()) in self.phrases
+
+    def step(self, state, token):
+        """Advance the automaton by one normalized token and return the new state"""
+        nxt = self.transitions[state].get(token)
+        if nxt is None:
+            nxt = self.root_transitions.get(token, self.ROOT)
+        return nxt
+
+    def count(self, tokens):
+        """Count filler phrase occurrences in a lowercased token stream.
+
+        Trailing '.,!?' is stripped from each token; tokens that are only
+        punctuation break phrases, so "you, know" does not match "you know".
+        """
+        step = self.step
+        match_counts = self.match_counts
+        state = self.ROOT
+        total = 0
+        for token in tokens:
+            state = step(state, token.strip('.,!?'))
+            total += match_counts[state]
+        return total
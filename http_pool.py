@@ -0,0 +1,83 @@
+import queue
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, shared between threads.
+
+    Each request borrows an idle connection (or opens one if none is free)
+    and returns it once the response has been read, so a burst of requests
+    reuses a handful of TCP/TLS connections instead of opening one per
+    request. At most maxsize idle connections are kept. A request that
+    fails on a reused connection (the server may have closed it while idle)
+    is retried once on a fresh one.
+    """
+
+    def __init__(self, base_url, maxsize=8):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or 'http'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.maxsize = maxsize
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def _new_connection(self, timeout):
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        with self._lock:
+            self.connections_opened += 1
+        return connection_class(self.host, self.port, timeout=timeout)
+
+    def _checkout(self, timeout):
+        """An idle connection (reused=True) or a new one"""
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection(timeout), False
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection, True
+
+    def _checkin(self, connection):
+        if self._idle.qsize() < self.maxsize:
+            self._idle.put(connection)
+        else:
+            connection.close()
+
+    def request(self, method, path, body=None, headers=None, timeout=None):
+        """Send a request and return (status, response body bytes)"""
+        connection, reused = self._checkout(timeout)
+        while True:
+            try:
+                connection.request(method, path, body=body, headers=headers or {})
+                response = connection.getresponse()
+                data = response.read()
+            except TimeoutError:
+                connection.close()
+                raise
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                if not reused:
+                    raise
+                # Stale keep-alive connection: try once more on a fresh one
+                connection, reused = self._new_connection(timeout), False
+                continue
+            with self._lock:
+                self.requests_sent += 1
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(connection)
+            return response.status, data
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,240 @@
+import io
+import time
+import wave
+import queue
+import threading
+import subprocess
+
+from audio_processing import to_mono_int16
+from audio_decoder import TARGET_SAMPLE_RATE, DecodeError
+from live_capture import LiveCapture
+from live_session import LiveSession, LIVE_WINDOWS
+
+
+class ChunkError(ValueError):
+    """An uploaded chunk could not be accepted"""
+
+
+class ChunkOrderError(ChunkError):
+    """A chunk arrived out of sequence"""
+
+
+class PcmChunkSource:
+    """Audio source fed with 16-bit mono PCM as chunks arrive.
+
+    Looks like a microphone to LiveCapture: stream.read() blocks until
+    audio is available and returns b'' once the source is closed and
+    drained.
+    """
+
+    SAMPLE_WIDTH = 2
+    CHUNK = 1024
+
+    def __init__(self, sample_rate=TARGET_SAMPLE_RATE):
+        self.SAMPLE_RATE = sample_rate
+        self.stream = self
+        self._pending = queue.Queue()
+        self._buffer = b''
+
+    def write(self, pcm_bytes):
+        if pcm_bytes:
+            self._pending.put(pcm_bytes)
+
+    def close(self):
+        self._pending.put(None)
+
+    def shutdown(self, timeout=None):
+        self.close()
+
+    def read(self, frames):
+        size = frames * self.SAMPLE_WIDTH
+        while not self._buffer:
+            data = self._pending.get()
+            if data is None:
+                # Leave the end marker for any later read
+                self._pending.put(None)
+                return b''
+            self._buffer = data
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class EncodedChunkSource:
+    """Audio source for compressed chunk streams (MediaRecorder WebM/Opus, Ogg).
+
+    MediaRecorder chunks are pieces of one continuous file, so they are
+    piped into a single ffmpeg process that decodes to 16 kHz mono PCM as
+    they arrive.
+    """
+
+    SAMPLE_WIDTH = 2
+    CHUNK = 1024
+    SAMPLE_RATE = TARGET_SAMPLE_RATE
+
+    def __init__(self, converter):
+        if converter is None:
+            raise DecodeError("ffmpeg is required to ingest compressed audio chunks")
+        self.process = subprocess.Popen(
+            [converter, '-nostdin', '-hide_banner', '-loglevel', 'error', '-i', 'pipe:0',
+             '-vn', '-ac', '1', '-ar', str(TARGET_SAMPLE_RATE), '-f', 's16le', 'pipe:1'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+
+    @property
+    def stream(self):
+        return self.process.stdout
+
+    def write(self, data):
+        try:
+            self.process.stdin.write(data)
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            raise ChunkError("audio decoder stopped; the chunk stream is not valid audio")
+
+    def close(self):
+        """End of input: ffmpeg decodes what it has and then exits"""
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    def shutdown(self, timeout=5.0):
+        """Close both pipes and reap ffmpeg, killing it if it hasn't exited within timeout"""
+        self.close()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            print("⚠️  Audio decoder did not exit; killing it")
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+
+
+def wav_chunk_to_pcm(data, sample_rate):
+    """PCM bytes of a standalone WAV chunk, which must be at the session's sample rate"""
+    try:
+        with wave.open(io.BytesIO(data), 'rb') as wav:
+            if wav.getframerate() != sample_rate:
+                raise ChunkError(f"chunk is {wav.getframerate()} Hz; this session expects {sample_rate} Hz")
+            raw = wav.readframes(wav.getnframes())
+            return to_mono_int16(raw, wav.getsampwidth(), wav.getnchannels()).tobytes()
+    except (wave.Error, EOFError) as e:
+        raise ChunkError(f"not a valid WAV chunk: {e}")
+
+
+class IngestSession:
+    """A lecture uploaded in short chunks while it is being given.
+
+    Chunks are decoded into a LiveCapture as they arrive, so phrases are
+    recognized and folded into live metrics during the lecture. finish()
+    then only has to recognize the last phrase and run the text analysis,
+    so the report is ready seconds after the last chunk.
+
+    Accepted chunk types: 'audio/wav' (each chunk a complete WAV file),
+    'audio/l16' (raw 16-bit little-endian mono PCM at the session's sample
+    rate) and, with ffmpeg, 'audio/webm' or 'audio/ogg' MediaRecorder
+    chunks. The type is fixed by the first chunk.
+    """
+
+    def __init__(self, engine, sample_rate=TARGET_SAMPLE_RATE, on_update=None, energy_threshold=None,
+                 workers=None, windows=LIVE_WINDOWS):
+        self.engine = engine
+        self.sample_rate = sample_rate
+        self.on_update = on_update
+        # None: estimated from the noise floor of the first seconds of audio, as for uploaded recordings
+        self.energy_threshold = energy_threshold or engine.recognizer_settings.get('energy_threshold')
+        self.workers = workers or engine.transcriber.workers
+        self.live = LiveSession(engine, start_time=0.0, windows=windows)
+        self.content_type = None
+        self.source = None
+        self.capture = None
+        self.chunks = 0
+        self.bytes_received = 0
+        self.results = None
+        self.last_activity = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _open(self, content_type):
+        if content_type in ('audio/wav', 'audio/x-wav', 'audio/wave', 'audio/l16'):
+            source = PcmChunkSource(self.sample_rate)
+        elif content_type in ('audio/webm', 'audio/ogg'):
+            source = EncodedChunkSource(self.engine.decoder.converter)
+        else:
+            raise ChunkError(f"unsupported chunk type: {content_type or 'none'}")
+        self.content_type, self.source = content_type, source
+        self.capture = LiveCapture(source, self.engine.recognizer_backend, self._on_phrase,
+                                   energy_threshold=self.energy_threshold, workers=self.workers)
+        self.capture.start()
+
+    def add_chunk(self, data, content_type, sequence=None):
+        """Queue one chunk for decoding and recognition; chunks must arrive in order"""
+        content_type = (content_type or '').split(';')[0].strip().lower()
+        with self._lock:
+            if self.results is not None:
+                raise ChunkError("session already finished")
+            if sequence is not None and sequence != self.chunks:
+                raise ChunkOrderError(f"expected chunk {self.chunks}, got {sequence}")
+            if self.source is None:
+                self._open(content_type)
+            elif content_type != self.content_type:
+                raise ChunkError(f"chunk type changed from {self.content_type} to {content_type}")
+
+            if content_type == 'audio/l16' and len(data) % 2:
+                raise ChunkError("16-bit PCM chunks must hold whole samples")
+            if content_type in ('audio/webm', 'audio/ogg', 'audio/l16'):
+                self.source.write(data)
+            else:
+                self.source.write(wav_chunk_to_pcm(data, self.sample_rate))
+            self.chunks += 1
+            self.bytes_received += len(data)
+            self.last_activity = time.monotonic()
+
+    def _on_phrase(self, text, start, end):
+        snapshot = self.live.add_chunk(text, now=end, start=start, end=end)
+        if self.on_update is not None:
+            self.on_update(snapshot)
+
+    @property
+    def audio_seconds(self):
+        return self.capture.frames_captured / self.capture.sample_rate if self.capture else 0.0
+
+    def finish(self):
+        """Recognize what is left, run the full analysis and return its results"""
+        with self._lock:
+            if self.results is not None:
+                return self.results
+            # Not idle while the last phrase is recognized
+            self.last_activity = time.monotonic()
+            if self.capture is not None:
+                # Drain every queued chunk before stopping the workers
+                self.source.close()
+                self.capture.wait()
+                self.capture.stop()
+                self.source.shutdown()
+
+            transcript = self.live.transcript
+            if not transcript:
+                results = self.engine.create_error_results("No speech was recognized in the uploaded chunks.")
+            else:
+                voiced_seconds = self.capture.detector.voiced_samples / self.capture.sample_rate
+                results = self.engine.analyze_text(transcript, self.audio_seconds, voiced_seconds)
+            results['segments'] = [segment.to_dict() for segment in self.live.segments]
+            results['ingest'] = {
+                'chunks': self.chunks,
+                'bytes_received': self.bytes_received,
+                'audio_seconds': round(self.audio_seconds, 3),
+                # Set by the capture's last flush, if any audio arrived
+                'energy_threshold': round(float(self.capture.detector.energy_threshold), 1) if self.capture else None
+            }
+            self.results = results
+            return results
+
+    def abort(self):
+        """Stop decoding and recognition without analyzing (abandoned sessions)"""
+        with self._lock:
+            if self.capture is not None and self.results is None:
+                # Ends the capture thread's read even if the decoder hangs; pending
+                # phrases are cancelled rather than spending recognizer quota
+                self.source.shutdown()
+                self.capture.stop(wait=False)
+            self.results = self.results or {}
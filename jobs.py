@@ -0,0 +1,236 @@
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Job lifecycle
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobStore:
+    """SQLite-backed job records, so job state survives a server restart.
+
+    Each operation opens its own connection, which keeps the store safe to
+    use from request threads and background workers at the same time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    filename TEXT,
+                    file_path TEXT,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    audio_hash TEXT,
+                    owner TEXT
+                )
+            """)
+            # Databases created before uploads were hashed or jobs were claimed lack the columns
+            columns = {row['name'] for row in db.execute("PRAGMA table_info(jobs)")}
+            if 'audio_hash' not in columns:
+                db.execute("ALTER TABLE jobs ADD COLUMN audio_hash TEXT")
+            if 'owner' not in columns:
+                db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Connection that commits on success and is always closed"""
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def create(self, filename, file_path, audio_hash=None):
+        """Record a new queued job and return its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO jobs (id, status, stage, filename, file_path, created, updated, audio_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, QUEUED, filename, file_path, now, now, audio_hash)
+            )
+        return job_id
+
+    def update(self, job_id, status=None, stage=None, result=None, error=None):
+        """Update the given fields of a job"""
+        fields = {'updated': time.time()}
+        if status is not None:
+            fields['status'] = status
+        if stage is not None:
+            fields['stage'] = stage
+        if result is not None:
+            fields['result'] = json.dumps(result)
+        if error is not None:
+            fields['error'] = error
+
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._connect() as db:
+            db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def claim(self, job_id, owner):
+        """Atomically mark a queued job as running for `owner`; False if another process got it"""
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, stage = ?, owner = ?, updated = ? WHERE id = ? AND status = ?",
+                (RUNNING, RUNNING, owner, time.time(), job_id, QUEUED)
+            )
+        return cursor.rowcount == 1
+
+    def requeue(self, job_id, owner):
+        """Put a running job back in the queue, only if `owner` still holds it"""
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, stage = ?, owner = NULL, updated = ? "
+                "WHERE id = ? AND status = ? AND owner IS ?",
+                (QUEUED, QUEUED, time.time(), job_id, RUNNING, owner)
+            )
+        return cursor.rowcount == 1
+
+    def get(self, job_id):
+        """Return a job as a dict (result decoded), or None if unknown"""
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def unfinished(self):
+        """Jobs that were queued or running, e.g. when the server last stopped"""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created", (QUEUED, RUNNING)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def owner_alive(owner):
+    """Whether the process that claimed a job (host:pid) may still be running it"""
+    if not owner:
+        return False
+    host, _, pid = owner.rpartition(':')
+    if host != socket.gethostname():
+        # Can't check another machine's processes; leave its jobs alone
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+
+class JobRunner:
+    """Runs jobs on a bounded pool of background threads.
+
+    work(job_id, file_path, set_stage) does the actual processing and
+    returns the result dict; the runner records status, stage and result
+    in the JobStore and deletes the uploaded file afterwards.
+
+    Several server processes can share one JobStore: a job only runs in the
+    process that claims it, so a job queued twice still runs once.
+    """
+
+    def __init__(self, store, work, workers=2, max_queued=100):
+        self.store = store
+        self.work = work
+        self.max_queued = max_queued
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analysis-job')
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self):
+        return self._pending
+
+    @property
+    def owner(self):
+        # Looked up on each claim: the runner may be created before a server forks its workers
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def submit(self, filename, file_path, audio_hash=None):
+        """Queue a job; returns its id, or None if the queue is full"""
+        with self._lock:
+            if self._pending >= self.max_queued:
+                return None
+            self._pending += 1
+        try:
+            job_id = self.store.create(filename, file_path, audio_hash)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        self.executor.submit(self._run, job_id, file_path)
+        return job_id
+
+    def resume(self):
+        """Requeue jobs left unfinished by a previous run of the server.
+
+        Jobs still held by a live process are left alone; the others are
+        claimed one at a time, so processes resuming at once never run a
+        job twice.
+        """
+        resumed = 0
+        for job in self.store.unfinished():
+            if job['status'] == RUNNING:
+                if owner_alive(job['owner']) or not self.store.requeue(job['id'], job['owner']):
+                    continue
+            if job['file_path'] and os.path.exists(job['file_path']):
+                with self._lock:
+                    self._pending += 1
+                self.executor.submit(self._run, job['id'], job['file_path'])
+                resumed += 1
+            else:
+                self.store.update(job['id'], status=FAILED, stage=FAILED,
+                                  error="Uploaded file was lost before the job could run")
+        if resumed:
+            print(f"✅ Resumed {resumed} unfinished analysis job(s)")
+        return resumed
+
+    def _run(self, job_id, file_path):
+        def set_stage(stage):
+            self.store.update(job_id, stage=stage)
+
+        if not self.store.claim(job_id, self.owner):
+            # Another process resumed or is running it; it also owns the upload
+            with self._lock:
+                self._pending -= 1
+            return
+
+        try:
+            result = self.work(job_id, file_path, set_stage)
+            self.store.update(job_id, status=DONE, stage=DONE, result=result)
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {e}")
+            self.store.update(job_id, status=FAILED, stage=FAILED, error=str(e))
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
@@ -1,96 +1,166 @@
 import os
+import re
 import time
 import json
+import hashlib
 import numpy as np
 import pandas as pd
 from textblob import TextBlob
+from textblob.en import sentiment as pattern_sentiment
 import speech_recognition as sr
 from collections import Counter
 import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 
+from nltk_resources import ensure_nltk_resources, prefetch_nltk_resources
+from filler_matcher import FillerMatcher, load_filler_lexicon
+from sentiment_lexicon import load_sentiment_lexicon, score_batch
+from audio_processing import (PcmAudio, WavSource, is_wav_file, detect_speech, segments_from_speech,
+                              pause_statistics, speech_coverage)
+from recognizer_backends import GoogleRecognizerBackend, ResilientBackend
+from transcription import ChunkedTranscriber, TranscriptionError, recognition_summary
+from audio_decoder import AudioDecoder
+from noise_profile import NoiseProfileStore, measure_noise_profile, microphone_key
+
 
-# Download necessary NLTK resources
 def download_nltk_resources():
-    """Download required NLTK resources if not already present"""
-    resources = [
-        'punkt',           # Tokenizer
-        'stopwords',       # Stopwords corpus
-        'averaged_perceptron_tagger',  # POS tagger
-    ]
-    
-    for resource in resources:
-        try:
-            nltk.download(resource, quiet=True)
-            print(f"✅ NLTK {resource} downloaded/available")
-        except Exception as e:
-            print(f"⚠️  Could not download {resource}: {e}")
-            # Continue with other resources
+    """Download required NLTK resources (kept for scripts that call it directly)"""
+    return prefetch_nltk_resources()
 
 
-# Initialize NLTK resources
-download_nltk_resources()
+# Check NLTK resources against local nltk_data only - never hits the network on import
+NLTK_STATUS = ensure_nltk_resources()
 
+# Bump when a change to transcription or analysis makes cached results stale
+ANALYSIS_VERSION = 6
 
-class LecturerSentimentAnalyzer:
-    def __init__(self):
-        self.recognizer = sr.Recognizer()
-        
-        # Initialize microphone only if available
-        try:
-            self.microphone = sr.Microphone()
-            self.mic_available = True
-            print("✅ Microphone available for live recording")
-        except OSError:
-            print("⚠️  No microphone detected. Live recording disabled.")
-            self.microphone = None
-            self.mic_available = False
-            
-        self.filler_words = ['um', 'uh', 'like', 'you know', 'so', 'actually', 'basically', 'literally', 'well', 'okay']
+DEFAULT_FILLER_WORDS = ('um', 'uh', 'like', 'you know', 'so', 'actually', 'basically', 'literally', 'well', 'okay')
+
+# Fallback tokenizer: decimals (so "3.14" doesn't end a sentence), words,
+# Treebank-style "n't" and single punctuation marks
+FALLBACK_TOKEN_PATTERN = re.compile(r"\d+(?:\.\d+)+|\w+(?=n't\b)|n't\b|\w+|[^\w\s]")
+
+FALLBACK_STOP_WORDS = frozenset([
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have',
+    'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
+])
+
+
+def detect_microphone():
+    """Return an sr.Microphone if one is usable, otherwise None"""
+    try:
+        microphone = sr.Microphone()
+        print("✅ Microphone available for live recording")
+        return microphone
+    except (OSError, AttributeError):
+        # AttributeError is raised when PyAudio is not installed
+        print("⚠️  No microphone detected. Live recording disabled.")
+        return None
+
+
+def categorize_polarity(polarity):
+    """Map a polarity score to a sentiment category"""
+    if polarity > 0.1:
+        return "Positive"
+    elif polarity < -0.1:
+        return "Negative"
+    return "Neutral"
+
+
+class AnalysisResult(dict):
+    """Results of one analysis run.
+
+    A plain dict underneath so it can be passed straight to jsonify/json.dump.
+    Each call to SentimentEngine creates its own instance, so results are
+    never shared between concurrent analyses.
+    """
+
+    def __init__(self, transcript=''):
+        super().__init__(transcript=transcript, sentiment={}, metrics={}, feedback=[])
+
+
+class SentimentEngine:
+    """Shareable analysis engine.
+
+    Holds only read-only configuration (filler automaton, stopwords, recognizer
+    settings and backend) that is built once in __init__ and never mutated afterwards.
+    Every method writes into the AnalysisResult it is given, so one engine can
+    serve any number of threads at once without locks.
+
+    text_only=True builds only what the text stages need (no recognizer
+    backend, transcriber or decoder), e.g. for analysis worker processes.
+    """
+
+    def __init__(self, filler_words=DEFAULT_FILLER_WORDS, stop_words=None, recognizer_settings=None,
+                 filler_lexicon=None, recognizer_backend=None, transcription_workers=4, decoder=None,
+                 text_only=False):
+        # Filler phrases, optionally extended from a per-deployment lexicon file
+        filler_words = list(filler_words)
+        if filler_lexicon:
+            try:
+                filler_words.extend(load_filler_lexicon(filler_lexicon))
+            except OSError as e:
+                print(f"⚠️  Could not load filler lexicon {filler_lexicon}: {e}")
+        self.filler_matcher = FillerMatcher(filler_words)
+        self.filler_words = self.filler_matcher.phrases
 
         # Initialize stopwords safely
-        try:
-            self.stop_words = set(stopwords.words('english'))
-        except Exception as e:
-            print(f"⚠️  Could not load stopwords: {e}")
-            # Fallback stopwords
-            self.stop_words = set([
-                'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have',
-                'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
-                'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
-            ])
-
-        self.results = {
-            'transcript': '',
-            'sentiment': {},
-            'metrics': {},
-            'feedback': []
-        }
+        if stop_words is None:
+            try:
+                stop_words = stopwords.words('english')
+            except Exception as e:
+                print(f"⚠️  Could not load stopwords: {e}")
+                stop_words = FALLBACK_STOP_WORDS
+        self.stop_words = frozenset(stop_words)
+
+        # Attributes applied to every sr.Recognizer this engine creates
+        self.recognizer_settings = dict(recognizer_settings or {})
+
+        if text_only:
+            self.recognizer_backend = self.transcriber = self.decoder = None
+        else:
+            # Speech-to-text service (by default with timeouts, retries and a circuit
+            # breaker); segments of one file are recognized in parallel
+            self.recognizer_backend = recognizer_backend or ResilientBackend(GoogleRecognizerBackend())
+            self.transcriber = ChunkedTranscriber(self.recognizer_backend, workers=transcription_workers)
 
-        # Live recording variables
-        self.is_recording = False
-        self.live_transcript = ""
-        self.start_time = None
+            # Converts uploads to 16 kHz mono WAV (cached per recording) before anything reads them
+            self.decoder = decoder or AudioDecoder()
 
-    def calibrate_microphone(self):
-        """Calibrate microphone for ambient noise"""
-        if not self.mic_available:
-            print("❌ Microphone not available for calibration")
-            return False
-            
-        print("Calibrating microphone for ambient noise...")
+        # Map the compiled sentiment lexicon (its arrays are shared between worker processes).
+        # If that fails, load TextBlob's own lexicon now rather than lazily
+        # inside concurrent requests, where several threads would race to parse it
         try:
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                print("✅ Microphone calibrated successfully.")
-                return True
+            self.sentiment_lexicon = load_sentiment_lexicon()
         except Exception as e:
-            print(f"❌ Could not calibrate microphone: {e}")
-            return False
-
-    def transcribe_audio(self, audio_file):
+            print(f"⚠️  Could not load compiled sentiment lexicon: {e}")
+            self.sentiment_lexicon = None
+            try:
+                TextBlob("good").sentiment
+            except Exception as e:
+                print(f"⚠️  Could not preload sentiment lexicon: {e}")
+
+        # Identifies everything that shapes a result, for keying cached analyses
+        self.fingerprint = hashlib.sha256(repr((
+            ANALYSIS_VERSION,
+            getattr(self.recognizer_backend, 'name', type(self.recognizer_backend).__name__),
+            sorted(self.recognizer_settings.items()),
+            sorted(self.filler_words),
+            sorted(self.stop_words),
+            self.sentiment_lexicon is not None
+        )).encode('utf-8')).hexdigest()[:16]
+
+    def make_recognizer(self):
+        """Create a fresh recognizer; recognizers keep per-call noise state so are not shared"""
+        recognizer = sr.Recognizer()
+        for name, value in self.recognizer_settings.items():
+            setattr(recognizer, name, value)
+        return recognizer
+
+    def transcribe_audio(self, audio_file, results, audio_hash=None):
         """Convert audio file to text using Speech Recognition"""
         print(f"Transcribing audio file: {audio_file}")
 
@@ -103,228 +173,207 @@ class LecturerSentimentAnalyzer:
             if not audio_file.lower().endswith(('.wav', '.flac', '.aiff', '.mp3', '.m4a', '.ogg')):
                 print("Warning: File format may not be optimal. Supported formats: WAV, FLAC, AIFF")
 
-            with sr.AudioFile(audio_file) as source:
-                # Adjust for ambient noise
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                print("Reading audio data...")
-                audio_data = self.recognizer.record(source)
+            # Decode to 16 kHz mono WAV once; audio_hash (if known) keys the decoded copy
+            audio_file = self.decoder.normalize(audio_file, audio_hash)
 
-                print("Converting speech to text...")
-                transcript = self.recognizer.recognize_google(audio_data)
-                self.results['transcript'] = transcript
-                print("✅ Transcription complete.")
-                return transcript
+            # WAV is read from disk block by block; other formats are decoded whole
+            audio = WavSource(audio_file) if is_wav_file(audio_file) else None
+            try:
+                if audio is None:
+                    with sr.AudioFile(audio_file) as source:
+                        print("Reading audio data...")
+                        audio = PcmAudio.from_audio_data(self.make_recognizer().record(source))
 
-        except sr.UnknownValueError:
-            error_msg = "Could not understand audio clearly. Please try with a clearer recording."
+                # One voice-activity pass gives the speech threshold (from the noise
+                # floor of the whole recording, unless configured), the measured
+                # timing and the segments; only detected speech goes to the recognizer
+                print("Converting speech to text...")
+                speech, frame_seconds, energy_threshold = detect_speech(
+                    audio, energy_threshold=self.recognizer_settings.get('energy_threshold')
+                )
+                results['acoustics'] = pause_statistics(speech, frame_seconds, audio.duration)
+                results['acoustics']['energy_threshold'] = round(float(energy_threshold), 1)
+                segments = segments_from_speech(speech, frame_seconds, audio.duration)
+                results['voice_activity'] = speech_coverage(segments, audio.duration)
+                print(f"Skipping {results['voice_activity']['skipped_percent']}% of the audio as silence")
+                transcript, segment_results = self.transcriber.transcribe(audio, segments)
+            finally:
+                if audio is not None:
+                    audio.close()
+            results['transcript'] = transcript
+            results['segments'] = segment_results
+            results['recognition'] = recognition_summary(segment_results)
+            print("✅ Transcription complete.")
+            return transcript
+
+        except TranscriptionError as e:
+            error_msg = str(e)
             print(f"Warning: {error_msg}")
-            self.results['transcript'] = error_msg
-            return self.results['transcript']
-        except sr.RequestError as e:
-            error_msg = f"Speech recognition service error: {e}"
-            print(f"Error: {error_msg}")
-            self.results['transcript'] = error_msg
-            return self.results['transcript']
+            results['transcript'] = error_msg
+            return results['transcript']
         except Exception as e:
             error_msg = f"Transcription failed: {str(e)}"
             print(f"Error: {error_msg}")
-            self.results['transcript'] = error_msg
-            return self.results['transcript']
-
-    def start_live_recording(self, update_interval=10):
-        """Start live recording and analysis"""
-        if not self.mic_available:
-            print("❌ Live recording not available - no microphone detected")
-            return
-
-        self.is_recording = True
-        self.start_time = time.time()
-        self.live_transcript = ""
-
-        print("Starting live recording... Press Ctrl+C to stop.")
-        if not self.calibrate_microphone():
-            return
-
-        try:
-            while self.is_recording:
-                try:
-                    # Record audio for the specified interval
-                    with self.microphone as source:
-                        audio_data = self.recognizer.listen(source, timeout=1, phrase_time_limit=update_interval)
-
-                    # Transcribe the audio chunk
-                    try:
-                        chunk_text = self.recognizer.recognize_google(audio_data)
-                        self.live_transcript += " " + chunk_text
-                        print(f"Recognized: {chunk_text}")
-
-                        # Update analysis
-                        self.analyze_live_sentiment()
-
-                    except sr.UnknownValueError:
-                        print("Could not understand audio chunk")
-                    except sr.RequestError as e:
-                        print(f"Speech recognition error: {e}")
-
-                except sr.WaitTimeoutError:
-                    # No speech detected in timeout period
-                    pass
-                except KeyboardInterrupt:
-                    print("\nStopping recording...")
-                    break
-
-        except Exception as e:
-            print(f"Error during live recording: {e}")
-        finally:
-            self.stop_live_recording()
-
-    def stop_live_recording(self):
-        """Stop live recording and perform final analysis"""
-        self.is_recording = False
-        if self.live_transcript.strip():
-            self.results['transcript'] = self.live_transcript.strip()
-            self.analyze_sentiment()
-            self.generate_feedback()
-            print("\n✅ Final analysis completed.")
-        else:
-            print("No speech was detected during recording.")
-
-    def analyze_live_sentiment(self):
-        """Analyze sentiment during live recording"""
-        if not self.live_transcript.strip():
-            return
-
-        # Perform quick analysis for live updates
-        blob = TextBlob(self.live_transcript)
-        sentiment_polarity = blob.sentiment.polarity
-
-        if sentiment_polarity > 0.1:
-            sentiment_category = "Positive"
-        elif sentiment_polarity < -0.1:
-            sentiment_category = "Negative"
-        else:
-            sentiment_category = "Neutral"
-
-        # Calculate live metrics
-        words = self.safe_tokenize(self.live_transcript)
-        word_count = len(words)
-        elapsed_time = time.time() - self.start_time if self.start_time else 1
-        speaking_rate = (word_count / elapsed_time) * 60 if elapsed_time > 0 else 0
-
-        # Count filler words
-        filler_count = sum(1 for word in words if word.lower().strip('.,!?') in self.filler_words)
-        filler_ratio = filler_count / word_count if word_count > 0 else 0
-
-        # Update live results
-        self.results.update({
-            'live_sentiment': {
-                'category': sentiment_category,
-                'polarity': float(sentiment_polarity)
-            },
-            'live_metrics': {
-                'word_count': word_count,
-                'speaking_rate': float(speaking_rate),
-                'filler_count': filler_count,
-                'filler_ratio': float(filler_ratio),
-                'session_time': float(elapsed_time)
-            }
-        })
-
-        # Print live update
-        print(f"\n--- LIVE UPDATE ---")
-        print(f"Sentiment: {sentiment_category} ({sentiment_polarity:.2f})")
-        print(f"Speaking Rate: {speaking_rate:.1f} words/minute")
-        print(f"Filler Words: {filler_ratio * 100:.1f}% ({filler_count} occurrences)")
-        print(f"Session Time: {elapsed_time / 60:.1f} minutes")
-        print(f"Current transcript length: {word_count} words")
-
-    def analyze_sentiment(self, text=None):
-        """Analyze sentiment of the transcribed text"""
-        if text is None:
-            text = self.results['transcript']
+            results['transcript'] = error_msg
+            return results['transcript']
 
+    def analyze_sentiment(self, text, results, duration_seconds=None, voiced_seconds=None):
+        """Analyze sentiment of the text and store sentiment and metrics in results"""
         if not text or len(text.strip()) < 5:
             print("Warning: No sufficient text to analyze")
-            self.results['sentiment'] = {
+            results['sentiment'] = {
                 'polarity': 0.0,
                 'subjectivity': 0.5,
                 'category': 'Neutral'
             }
-            self.calculate_basic_metrics(text or "")
-            return self.results['sentiment']
+            self.calculate_basic_metrics(text or "", results)
+            return results['sentiment']
 
         print("Analyzing sentiment...")
 
         try:
-            # Sentiment analysis using TextBlob
-            blob = TextBlob(text)
-            sentiment_polarity = blob.sentiment.polarity
-            sentiment_subjectivity = blob.sentiment.subjectivity
-
-            # Categorize sentiment
-            if sentiment_polarity > 0.1:
-                sentiment_category = "Positive"
-            elif sentiment_polarity < -0.1:
-                sentiment_category = "Negative"
-            else:
-                sentiment_category = "Neutral"
+            # Tokenize once; the sentiment scorer and the metrics share the tokens
+            words = self.safe_tokenize(text)
+
+            # Sentiment analysis using TextBlob's pattern lexicon
+            sentiment_polarity, sentiment_subjectivity = self.score_tokens(words)
 
-            self.results['sentiment'] = {
+            results['sentiment'] = {
                 'polarity': float(sentiment_polarity),
                 'subjectivity': float(sentiment_subjectivity),
-                'category': sentiment_category
+                'category': categorize_polarity(sentiment_polarity)
             }
 
             # Calculate additional metrics
-            self.calculate_metrics(text)
+            self.calculate_metrics(text, results, duration_seconds, words=words, voiced_seconds=voiced_seconds)
 
             print("✅ Sentiment analysis complete.")
-            return self.results['sentiment']
+            return results['sentiment']
 
         except Exception as e:
             print(f"Error in sentiment analysis: {e}")
-            self.results['sentiment'] = {
+            results['sentiment'] = {
                 'polarity': 0.0,
                 'subjectivity': 0.5,
                 'category': 'Neutral'
             }
-            self.calculate_basic_metrics(text)
-            return self.results['sentiment']
+            self.calculate_basic_metrics(text, results)
+            return results['sentiment']
+
+    def score_tokens(self, words):
+        """Polarity and subjectivity of lowercased tokens using TextBlob's pattern lexicon.
+
+        Same scoring as TextBlob(text).sentiment, but on tokens we already have
+        instead of letting TextBlob tokenize the text a second time.
+        """
+        if self.sentiment_lexicon is not None:
+            polarity, subjectivity = score_batch(self.sentiment_lexicon, [words])
+            return float(polarity[0]), float(subjectivity[0])
+        polarity, subjectivity = pattern_sentiment(words)[:2]
+        return polarity, subjectivity
+
+    def analyze_sentiment_batch(self, texts):
+        """Score many transcripts at once with vectorized lexicon lookups.
+
+        Returns one sentiment dict per text, in the same shape as
+        results['sentiment']. See sentiment_lexicon.score_batch for how
+        closely the scores follow TextBlob.
+        """
+        if self.sentiment_lexicon is None:
+            print("⚠️  Sentiment lexicon unavailable, scoring texts one at a time")
+            scores = [self.score_tokens(self.safe_tokenize(text)) if text else (0.0, 0.0) for text in texts]
+            polarities, subjectivities = zip(*scores) if scores else ((), ())
+        else:
+            token_lists = [self.safe_tokenize(text) if text else [] for text in texts]
+            polarities, subjectivities = score_batch(self.sentiment_lexicon, token_lists)
+
+        sentiments = []
+        for text, polarity, subjectivity in zip(texts, polarities, subjectivities):
+            if not text or len(text.strip()) < 5:
+                sentiments.append({'polarity': 0.0, 'subjectivity': 0.5, 'category': 'Neutral'})
+                continue
+            sentiments.append({
+                'polarity': float(polarity),
+                'subjectivity': float(subjectivity),
+                'category': categorize_polarity(polarity)
+            })
+        return sentiments
+
+    def token_stats(self, words):
+        """Count fillers (including multi-word ones), content words, unique content words and sentences in one pass"""
+        stop_words = self.stop_words
+        filler_step = self.filler_matcher.step
+        filler_matches = self.filler_matcher.match_counts
+        filler_state = FillerMatcher.ROOT
+
+        filler_count = 0
+        content_word_count = 0
+        unique_words = set()
+        sentence_count = 0
+        in_sentence = False
+
+        for word in words:
+            filler_state = filler_step(filler_state, word.strip('.,!?'))
+            filler_count += filler_matches[filler_state]
+            if len(word) > 2 and word.isalpha() and word not in stop_words:
+                content_word_count += 1
+                unique_words.add(word)
+
+            # A token ending in '.' closes the current sentence, if it has any words
+            if word != '.':
+                in_sentence = True
+            if in_sentence and word.endswith('.'):
+                sentence_count += 1
+                in_sentence = False
+
+        if in_sentence:
+            sentence_count += 1
 
-    def calculate_metrics(self, text):
-        """Calculate various speaking metrics from the transcript"""
+        return {
+            'filler_count': filler_count,
+            'content_words': content_word_count,
+            'unique_words': len(unique_words),
+            'sentence_count': sentence_count
+        }
+
+    def calculate_metrics(self, text, results, duration_seconds=None, words=None, voiced_seconds=None):
+        """Calculate various speaking metrics from the transcript.
+
+        Pass the tokens as words if they are already available to skip
+        tokenizing again. duration_seconds and voiced_seconds are measured
+        from the audio when known; without them the duration is estimated.
+        """
         try:
-            words = self.safe_tokenize(text)
+            if words is None:
+                words = self.safe_tokenize(text)
             word_count = len(words)
+            stats = self.token_stats(words)
 
-            # Better duration estimation
-            if hasattr(self, 'start_time') and self.start_time:
-                actual_duration = time.time() - self.start_time
-                estimated_duration = max(actual_duration, word_count / 2.5)
+            # Measured duration when available; otherwise estimate from a typical rate (150 wpm)
+            if duration_seconds:
+                estimated_duration = duration_seconds
             else:
-                # Estimate based on typical speaking rate (150 wpm)
                 estimated_duration = max(60, word_count / 2.5)
 
             speaking_rate = (word_count / estimated_duration) * 60 if estimated_duration > 0 else 0
+            # Words per minute of actual speech, excluding pauses
+            articulation_rate = (word_count / voiced_seconds) * 60 if voiced_seconds else None
 
             # Filler word analysis
-            filler_count = sum(1 for word in words if word.lower().strip('.,!?') in self.filler_words)
+            filler_count = stats['filler_count']
             filler_ratio = filler_count / word_count if word_count > 0 else 0
 
             # Sentence analysis
-            sentences = [s.strip() for s in text.split('.') if s.strip()]
-            sentence_count = max(1, len(sentences))
+            sentence_count = max(1, stats['sentence_count'])
             avg_sentence_length = word_count / sentence_count
 
             # Vocabulary analysis
-            content_words = [w.lower() for w in words if
-                             w.lower() not in self.stop_words and w.isalpha() and len(w) > 2]
-            content_word_count = len(content_words)
-            unique_words = len(set(content_words))
+            content_word_count = stats['content_words']
+            unique_words = stats['unique_words']
             vocabulary_richness = unique_words / content_word_count if content_word_count > 0 else 0
 
             # Store metrics
-            self.results['metrics'] = {
+            results['metrics'] = {
                 'word_count': word_count,
                 'speaking_rate': float(speaking_rate),
                 'filler_count': filler_count,
@@ -332,6 +381,8 @@ class LecturerSentimentAnalyzer:
                 'avg_sentence_length': float(avg_sentence_length),
                 'vocabulary_richness': float(vocabulary_richness),
                 'duration_seconds': float(estimated_duration),
+                'duration_measured': bool(duration_seconds),
+                'articulation_rate': float(articulation_rate) if articulation_rate is not None else None,
                 'sentence_count': sentence_count,
                 'unique_words': unique_words,
                 'content_words': content_word_count
@@ -339,15 +390,17 @@ class LecturerSentimentAnalyzer:
 
         except Exception as e:
             print(f"Error calculating metrics: {e}")
-            self.calculate_basic_metrics(text)
+            self.calculate_basic_metrics(text, results)
 
-    def calculate_basic_metrics(self, text):
+        return results['metrics']
+
+    def calculate_basic_metrics(self, text, results):
         """Calculate basic metrics when full analysis fails"""
         try:
             words = text.split() if text else []
             word_count = len(words)
 
-            self.results['metrics'] = {
+            results['metrics'] = {
                 'word_count': word_count,
                 'speaking_rate': 120.0,
                 'filler_count': 0,
@@ -361,7 +414,7 @@ class LecturerSentimentAnalyzer:
             }
         except Exception as e:
             print(f"Error in basic metrics calculation: {e}")
-            self.results['metrics'] = {
+            results['metrics'] = {
                 'word_count': 0,
                 'speaking_rate': 120.0,
                 'filler_count': 0,
@@ -373,28 +426,33 @@ class LecturerSentimentAnalyzer:
                 'unique_words': 0,
                 'content_words': 0
             }
+        return results['metrics']
 
     def safe_tokenize(self, text):
         """Safely tokenize text with fallback"""
         try:
             return word_tokenize(text.lower())
         except Exception as e:
-            print(f"NLTK tokenization failed: {e}, using simple split")
-            return text.lower().split()
+            print(f"NLTK tokenization failed: {e}, using regex tokenizer")
+            return FALLBACK_TOKEN_PATTERN.findall(text.lower())
 
-    def generate_feedback(self):
+    def count_fillers(self, words):
+        """Count single- and multi-word fillers in a token list"""
+        return self.filler_matcher.count(words)
+
+    def generate_feedback(self, results):
         """Generate comprehensive feedback based on analysis"""
         print("Generating feedback...")
         feedback = []
 
-        if not self.results.get('metrics'):
+        if not results.get('metrics'):
             feedback.append("Analysis completed, but detailed metrics are not available.")
-            self.results['feedback'] = feedback
+            results['feedback'] = feedback
             return feedback
 
         try:
-            sentiment = self.results.get('sentiment', {})
-            metrics = self.results.get('metrics', {})
+            sentiment = results.get('sentiment', {})
+            metrics = results.get('metrics', {})
 
             # Sentiment feedback
             sentiment_category = sentiment.get('category', 'Neutral')
@@ -456,9 +514,251 @@ class LecturerSentimentAnalyzer:
             print(f"Error generating feedback: {e}")
             feedback.append("Analysis completed. Continue working on clear communication.")
 
-        self.results['feedback'] = feedback
+        results['feedback'] = feedback
         return feedback
 
+    def analyze_text(self, text, duration_seconds=None, voiced_seconds=None):
+        """Run sentiment, metrics and feedback on a transcript and return a new AnalysisResult"""
+        results = AnalysisResult(transcript=text)
+        self.analyze_sentiment(text, results, duration_seconds, voiced_seconds)
+        self.generate_feedback(results)
+        return results
+
+    def run_analysis_from_file(self, audio_file, text_analyzer=None, on_stage=None, audio_hash=None):
+        """Run complete analysis on an audio file and return a new AnalysisResult.
+
+        text_analyzer replaces analyze_text for the text stages, e.g. to run
+        them in an AnalysisPool worker process. on_stage, if given, is called
+        with the name of each stage as it starts ('transcribing', 'analyzing').
+        audio_hash, the file's SHA-256 if already known, saves rehashing it.
+        """
+        try:
+            print(f"Starting analysis of: {audio_file}")
+
+            if not os.path.exists(audio_file):
+                raise FileNotFoundError(f"Audio file not found: {audio_file}")
+
+            # Get file info
+            file_size = os.path.getsize(audio_file)
+            print(f"File size: {file_size:,} bytes")
+
+            # Transcribe and analyze
+            results = AnalysisResult()
+            if on_stage:
+                on_stage('transcribing')
+            transcript = self.transcribe_audio(audio_file, results, audio_hash)
+            if on_stage:
+                on_stage('analyzing')
+            acoustics = results.get('acoustics', {})
+            results.update((text_analyzer or self.analyze_text)(
+                transcript, acoustics.get('total_seconds'), acoustics.get('voiced_seconds')
+            ))
+
+            print("\n✅ Analysis completed successfully!")
+            return results
+
+        except Exception as e:
+            print(f"❌ Error in analysis: {e}")
+            return self.create_error_results(str(e))
+
+    def create_error_results(self, error_msg):
+        """Create basic results structure for error cases"""
+        results = AnalysisResult(transcript=f"Analysis failed: {error_msg}")
+        results.update({
+            'sentiment': {'polarity': 0.0, 'subjectivity': 0.5, 'category': 'Neutral'},
+            'metrics': {
+                'word_count': 0, 'speaking_rate': 0, 'filler_count': 0,
+                'filler_ratio': 0.0, 'avg_sentence_length': 0,
+                'vocabulary_richness': 0, 'duration_seconds': 0,
+                'sentence_count': 0, 'unique_words': 0, 'content_words': 0
+            },
+            'feedback': [f"❌ Analysis error: {error_msg}",
+                         "Please check your audio file and try again."]
+        })
+        return results
+
+
+class LecturerSentimentAnalyzer:
+    """Stateful front end for the CLI and live recording.
+
+    Keeps the results of the last analysis in self.results and delegates the
+    work to a SentimentEngine. One instance per session; to analyze in
+    parallel share a SentimentEngine instead.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine or SentimentEngine()
+        self.recognizer = self.engine.make_recognizer()
+
+        # Initialize microphone only if available
+        self.microphone = detect_microphone()
+        self.mic_available = self.microphone is not None
+        # Room noise measured per microphone, reused so sessions start without calibrating
+        self.noise_profiles = NoiseProfileStore()
+
+        self.filler_words = self.engine.filler_words
+        self.stop_words = self.engine.stop_words
+
+        self.results = AnalysisResult()
+
+        # Live recording variables
+        self.is_recording = False
+        self.live_session = None
+        self.start_time = None
+        # Called with each live snapshot (live_sentiment/live_metrics), e.g. to push it to a dashboard
+        self.on_live_update = None
+        # Rolling windows (seconds) for recent pace and sentiment; None uses live_session.LIVE_WINDOWS
+        self.live_windows = None
+
+    def calibrate_microphone(self, force=False):
+        """Set the speech threshold from this microphone's saved noise profile, measuring it if needed"""
+        if not self.mic_available:
+            print("❌ Microphone not available for calibration")
+            return False
+
+        device_key = microphone_key(self.microphone)
+        profile = None if force else self.noise_profiles.get(device_key)
+        if profile:
+            self.recognizer.energy_threshold = profile['energy_threshold']
+            print("✅ Using saved noise profile for this microphone.")
+            return True
+
+        print("Calibrating microphone for ambient noise...")
+        try:
+            with self.microphone as source:
+                audio_data = self.recognizer.record(source, duration=1)
+            profile = measure_noise_profile(audio_data)
+            self.recognizer.energy_threshold = profile['energy_threshold']
+            self.noise_profiles.save(device_key, profile)
+            print("✅ Microphone calibrated successfully.")
+            return True
+        except Exception as e:
+            print(f"❌ Could not calibrate microphone: {e}")
+            return False
+
+    def transcribe_audio(self, audio_file):
+        """Convert audio file to text using Speech Recognition"""
+        return self.engine.transcribe_audio(audio_file, self.results)
+
+    def start_live_recording(self, update_interval=10):
+        """Start live recording and analysis"""
+        if not self.mic_available:
+            print("❌ Live recording not available - no microphone detected")
+            return
+
+        self.is_recording = True
+        self.start_time = time.time()
+        self.live_session = self._new_live_session()
+
+        print("Starting live recording... Press Ctrl+C to stop.")
+        if not self.calibrate_microphone():
+            return
+
+        from live_capture import LiveCapture
+
+        try:
+            # Capture runs on its own thread and recognition on a worker pool,
+            # so audio keeps being recorded while phrases are being recognized
+            with self.microphone as source:
+                capture = LiveCapture(source, self.engine.recognizer_backend, self._on_live_phrase,
+                                      energy_threshold=self.recognizer.energy_threshold,
+                                      workers=self.engine.transcriber.workers,
+                                      pause_seconds=self.recognizer.pause_threshold,
+                                      phrase_time_limit=update_interval)
+                capture.start()
+                try:
+                    while self.is_recording:
+                        time.sleep(0.25)
+                except KeyboardInterrupt:
+                    print("\nStopping recording...")
+                finally:
+                    capture.stop()
+
+        except Exception as e:
+            print(f"Error during live recording: {e}")
+        finally:
+            self.stop_live_recording()
+
+    def _new_live_session(self):
+        from live_session import LiveSession, LIVE_WINDOWS
+        return LiveSession(self.engine, self.start_time, windows=self.live_windows or LIVE_WINDOWS)
+
+    def _on_live_phrase(self, chunk_text, start, end):
+        """Called with each recognized phrase, in the order they were spoken"""
+        print(f"Recognized: {chunk_text}")
+
+        # Update analysis with just the new chunk
+        self.analyze_live_sentiment(chunk_text, start, end)
+
+    @property
+    def live_transcript(self):
+        """Transcript of the live session so far, joined from its segments on demand"""
+        return self.live_session.transcript if self.live_session else ""
+
+    def stop_live_recording(self):
+        """Stop live recording and perform final analysis"""
+        self.is_recording = False
+        transcript = self.live_transcript
+        if transcript.strip():
+            self.results['transcript'] = transcript
+            self.results['segments'] = [segment.to_dict() for segment in self.live_session.segments]
+            self.analyze_sentiment()
+            self.generate_feedback()
+            print("\n✅ Final analysis completed.")
+        else:
+            print("No speech was detected during recording.")
+
+    def analyze_live_sentiment(self, chunk_text, start=None, end=None):
+        """Fold a newly recognized chunk into the live analysis"""
+        if self.live_session is None:
+            self.live_session = self._new_live_session()
+
+        # Update live results from the running totals
+        snapshot = self.live_session.add_chunk(chunk_text, start=start, end=end)
+        self.results.update(snapshot)
+        if self.on_live_update is not None:
+            self.on_live_update(snapshot)
+
+        sentiment = self.results['live_sentiment']
+        metrics = self.results['live_metrics']
+
+        # Print live update
+        print(f"\n--- LIVE UPDATE ---")
+        print(f"Sentiment: {sentiment['category']} ({sentiment['polarity']:.2f})")
+        print(f"Speaking Rate: {metrics['speaking_rate']:.1f} words/minute")
+        print(f"Filler Words: {metrics['filler_ratio'] * 100:.1f}% ({metrics['filler_count']} occurrences)")
+        for label, window in metrics['windows'].items():
+            print(f"Last {label}: {window['category']} ({window['polarity']:.2f}), "
+                  f"{window['speaking_rate']:.1f} words/minute")
+        print(f"Session Time: {metrics['session_time'] / 60:.1f} minutes")
+        print(f"Current transcript length: {metrics['word_count']} words")
+
+    def _session_duration(self):
+        """Elapsed live session time, or None when not analyzing a live session"""
+        return time.time() - self.start_time if self.start_time else None
+
+    def analyze_sentiment(self, text=None):
+        """Analyze sentiment of the transcribed text"""
+        if text is None:
+            text = self.results['transcript']
+        return self.engine.analyze_sentiment(text, self.results, self._session_duration())
+
+    def calculate_metrics(self, text):
+        """Calculate various speaking metrics from the transcript"""
+        return self.engine.calculate_metrics(text, self.results, self._session_duration())
+
+    def calculate_basic_metrics(self, text):
+        """Calculate basic metrics when full analysis fails"""
+        return self.engine.calculate_basic_metrics(text, self.results)
+
+    def safe_tokenize(self, text):
+        """Safely tokenize text with fallback"""
+        return self.engine.safe_tokenize(text)
+
+    def generate_feedback(self):
+        """Generate comprehensive feedback based on analysis"""
+        return self.engine.generate_feedback(self.results)
+
     def save_results(self, filename="lecture_analysis.json"):
         """Save analysis results to JSON file"""
         try:
@@ -496,6 +796,12 @@ class LecturerSentimentAnalyzer:
             print(f"Avg Sentence Length: {metrics.get('avg_sentence_length', 0):.1f} words")
             print(f"Vocabulary Richness: {metrics.get('vocabulary_richness', 0):.3f}")
 
+        acoustics = self.results.get('acoustics')
+        if acoustics:
+            print(f"Voiced: {acoustics['voiced_seconds']:.0f}s of {acoustics['total_seconds']:.0f}s | "
+                  f"Pauses: {acoustics['pause_count']} (mean {acoustics['mean_pause']:.1f}s, "
+                  f"longest {acoustics['longest_pause']:.1f}s)")
+
         # Feedback
         feedback = self.results.get('feedback', [])
         if feedback:
@@ -505,42 +811,12 @@ class LecturerSentimentAnalyzer:
 
     def run_analysis_from_file(self, audio_file):
         """Run complete analysis on an audio file"""
-        try:
-            print(f"Starting analysis of: {audio_file}")
-
-            if not os.path.exists(audio_file):
-                raise FileNotFoundError(f"Audio file not found: {audio_file}")
-
-            # Get file info
-            file_size = os.path.getsize(audio_file)
-            print(f"File size: {file_size:,} bytes")
-
-            # Transcribe and analyze
-            transcript = self.transcribe_audio(audio_file)
-            self.analyze_sentiment(transcript)
-            self.generate_feedback()
-
-            print("\n✅ Analysis completed successfully!")
-            return self.results
-
-        except Exception as e:
-            print(f"❌ Error in analysis: {e}")
-            return self.create_error_results(str(e))
+        self.results = self.engine.run_analysis_from_file(audio_file)
+        return self.results
 
     def create_error_results(self, error_msg):
         """Create basic results structure for error cases"""
-        return {
-            'transcript': f"Analysis failed: {error_msg}",
-            'sentiment': {'polarity': 0.0, 'subjectivity': 0.5, 'category': 'Neutral'},
-            'metrics': {
-                'word_count': 0, 'speaking_rate': 0, 'filler_count': 0,
-                'filler_ratio': 0.0, 'avg_sentence_length': 0,
-                'vocabulary_richness': 0, 'duration_seconds': 0,
-                'sentence_count': 0, 'unique_words': 0, 'content_words': 0
-            },
-            'feedback': [f"❌ Analysis error: {error_msg}",
-                         "Please check your audio file and try again."]
-        }
+        return self.engine.create_error_results(error_msg)
 
 
 # Demo and testing
@@ -553,9 +829,9 @@ if __name__ == "__main__":
     # Test with sample text
     print("\n📝 Testing with sample text...")
     sample_text = """
-    Hello students, today we will learn about machine learning. 
+    Hello students, today we will learn about machine learning.
     Um, it's a very interesting topic and, like, it has many applications in our daily lives.
-    Machine learning is basically a subset of artificial intelligence that, well, 
+    Machine learning is basically a subset of artificial intelligence that, well,
     enables computers to learn without being explicitly programmed.
     """
 
@@ -570,4 +846,5 @@ if __name__ == "__main__":
     print("- analyzer.start_live_recording()              # Live recording mode")
     print("- analyzer.print_results()                     # Display results")
     print("- analyzer.save_results('results.json')        # Save to file")
-    print("=" * 50)
\ No newline at end of file
+    print("- SentimentEngine().analyze_text(text)         # Thread-safe analysis")
+    print("=" * 50)
@@ -0,0 +1,238 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import speech_recognition as sr
+
+from audio_processing import to_mono_int16, frame_rms, noise_threshold
+
+
+class PcmRingBuffer:
+    """Fixed-size circular store of 16-bit samples, allocated once.
+
+    Positions are absolute sample indices since the start of capture. Only
+    the last `capacity` samples can be read back; reading older audio
+    counts as an overrun and returns None.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self.samples = np.zeros(self.capacity, dtype=np.int16)
+        self.written = 0
+        self.overruns = 0
+
+    def write(self, samples):
+        n = len(samples)
+        if n > self.capacity:
+            self.written += n - self.capacity
+            samples, n = samples[-self.capacity:], self.capacity
+        offset = self.written % self.capacity
+        first = min(n, self.capacity - offset)
+        self.samples[offset:offset + first] = samples[:first]
+        self.samples[:n - first] = samples[first:]
+        self.written += n
+
+    def read(self, start, end):
+        """Copy of samples [start, end), or None if they have been overwritten"""
+        if start < self.written - self.capacity or end > self.written:
+            self.overruns += 1
+            return None
+        offset, n = start % self.capacity, end - start
+        first = min(n, self.capacity - offset)
+        return np.concatenate((self.samples[offset:offset + first], self.samples[:n - first]))
+
+
+class PhraseDetector:
+    """Incremental energy-based phrase splitting for a live stream.
+
+    feed() looks at the frames written to the ring buffer since the last
+    call and returns the (start, end) sample spans of phrases that have
+    ended: after pause_seconds of silence, or when a phrase reaches
+    phrase_time_limit. Spans are padded by `padding` seconds of context.
+
+    With energy_threshold=None the threshold is estimated from the noise
+    floor of the first calibration_seconds of the stream (the same estimate
+    used for uploaded recordings); nothing is detected until then.
+    """
+
+    def __init__(self, sample_rate, energy_threshold, frame_ms=30, pause_seconds=0.8,
+                 phrase_time_limit=10.0, min_phrase=0.3, padding=0.2, calibration_seconds=5.0):
+        self.sample_rate = sample_rate
+        self.energy_threshold = energy_threshold
+        self.calibration_samples = int(calibration_seconds * sample_rate)
+        self.frame_length = max(1, int(sample_rate * frame_ms / 1000))
+        self.pause_samples = int(pause_seconds * sample_rate)
+        self.max_samples = int(phrase_time_limit * sample_rate)
+        self.min_samples = int(min_phrase * sample_rate)
+        self.padding = int(padding * sample_rate)
+        self.analyzed = 0
+        self.voiced_samples = 0
+        self.phrase_start = None
+        self.last_voiced = None
+
+    def _close(self, end):
+        start = max(0, self.phrase_start - self.padding)
+        voiced = self.last_voiced - self.phrase_start
+        self.phrase_start = self.last_voiced = None
+        return (start, end) if voiced >= self.min_samples else None
+
+    def calibrate(self, ring):
+        """Set the threshold from the noise floor of the audio captured so far"""
+        start = max(0, ring.written - ring.capacity)
+        n_frames = (ring.written - start) // self.frame_length
+        block = ring.read(start, start + n_frames * self.frame_length)
+        rms = frame_rms(block, self.frame_length) if n_frames else []
+        self.energy_threshold = noise_threshold(rms)
+
+    def feed(self, ring, final=False):
+        spans = []
+        if self.energy_threshold is None:
+            if ring.written < self.calibration_samples and not final:
+                return spans
+            self.calibrate(ring)
+        n_frames = (ring.written - self.analyzed) // self.frame_length
+        if n_frames == 0:
+            return spans
+        block = ring.read(self.analyzed, self.analyzed + n_frames * self.frame_length)
+        if block is None:
+            # Fell behind the writer; skip to the audio still in the buffer
+            self.analyzed = ring.written - ring.written % self.frame_length
+            return spans
+        voiced = frame_rms(block, self.frame_length) > self.energy_threshold
+        self.voiced_samples += int(voiced.sum()) * self.frame_length
+        for i, is_voiced in enumerate(voiced):
+            frame_end = self.analyzed + (i + 1) * self.frame_length
+            if is_voiced:
+                if self.phrase_start is None:
+                    self.phrase_start = frame_end - self.frame_length
+                self.last_voiced = frame_end
+            if self.phrase_start is None:
+                continue
+            if frame_end - self.last_voiced >= self.pause_samples:
+                spans.append(self._close(min(frame_end, self.last_voiced + self.padding)))
+            elif frame_end - self.phrase_start >= self.max_samples:
+                spans.append(self._close(frame_end))
+        self.analyzed += n_frames * self.frame_length
+        return [span for span in spans if span]
+
+    def flush(self, ring):
+        """Spans still pending when the stream ends: a phrase left open, or all
+        of a stream that ended before calibration finished"""
+        spans = self.feed(ring, final=True) if self.energy_threshold is None else []
+        if self.phrase_start is not None:
+            span = self._close(self.analyzed)
+            if span:
+                spans.append(span)
+        return spans
+
+
+class LiveCapture:
+    """Live recording with capture and recognition on separate threads.
+
+    One capture thread does nothing but read the microphone into a
+    preallocated PcmRingBuffer and cut it into phrases, so it never waits
+    on the network. Phrases are recognized on a pool of worker threads and
+    on_result(text, start_seconds, end_seconds) is called for each in the
+    order the phrases were spoken, one call at a time, however the
+    requests finish.
+
+    energy_threshold=None estimates the speech threshold from the stream
+    itself (see PhraseDetector).
+
+    `source` is an open microphone (an entered sr.Microphone or anything
+    with a stream.read(frames) and SAMPLE_RATE, SAMPLE_WIDTH and CHUNK);
+    an empty read ends the capture.
+    """
+
+    def __init__(self, source, backend, on_result, energy_threshold=300, workers=4, buffer_seconds=60,
+                 **phrase_options):
+        self.source = source
+        self.backend = backend
+        self.on_result = on_result
+        self.sample_rate = source.SAMPLE_RATE
+        self.ring = PcmRingBuffer(buffer_seconds * self.sample_rate)
+        self.detector = PhraseDetector(self.sample_rate, energy_threshold, **phrase_options)
+        self.workers = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='live-recognizer')
+        self.phrases = 0
+        self._running = False
+        self._thread = None
+        self._merge_lock = threading.Lock()
+        self._finished = {}
+        self._next_to_emit = 0
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._capture, name='live-capture', daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=True):
+        """Stop capturing, then wait for phrases already captured to be recognized.
+
+        wait=False cancels phrases not yet sent to the recognizer instead
+        (nobody will read them) and returns without waiting for those in flight.
+        """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+        self.workers.shutdown(wait=wait, cancel_futures=not wait)
+
+    def wait(self):
+        """Block until the source runs out of audio"""
+        if self._thread is not None:
+            self._thread.join()
+
+    @property
+    def frames_captured(self):
+        return self.ring.written
+
+    def _capture(self):
+        width = self.source.SAMPLE_WIDTH
+        try:
+            while self._running:
+                raw = self.source.stream.read(self.source.CHUNK)
+                if not raw:
+                    break
+                self.ring.write(to_mono_int16(raw, width, 1))
+                self._dispatch(self.detector.feed(self.ring))
+        except Exception as e:
+            print(f"❌ Audio capture stopped: {e}")
+        self._dispatch(self.detector.flush(self.ring))
+
+    def _dispatch(self, spans):
+        for start, end in spans:
+            samples = self.ring.read(start, end)
+            sequence = self.phrases
+            self.phrases += 1
+            if samples is None:
+                print("⚠️  Phrase was overwritten before it could be recognized; increase buffer_seconds")
+                self._finish(sequence, None)
+                continue
+            audio_data = sr.AudioData(samples.tobytes(), self.sample_rate, 2)
+            self.workers.submit(self._recognize, sequence, audio_data,
+                                start / self.sample_rate, end / self.sample_rate)
+
+    def _recognize(self, sequence, audio_data, start, end):
+        result = None
+        try:
+            result = (self.backend.recognize(audio_data), start, end)
+        except sr.UnknownValueError:
+            print("Could not understand audio chunk")
+        except sr.RequestError as e:
+            print(f"Speech recognition error: {e}")
+        except Exception as e:
+            print(f"❌ Speech recognition failed: {e}")
+        finally:
+            # Always fill this sequence number, or every later phrase waits on it
+            self._finish(sequence, result)
+
+    def _finish(self, sequence, result):
+        """Record a finished phrase and emit every result that is now next in order"""
+        with self._merge_lock:
+            self._finished[sequence] = result
+            while self._next_to_emit in self._finished:
+                result = self._finished.pop(self._next_to_emit)
+                self._next_to_emit += 1
+                if result is not None:
+                    try:
+                        self.on_result(*result)
+                    except Exception as e:
+                        print(f"❌ Live analysis failed: {e}")
@@ -0,0 +1,214 @@
+import time
+import threading
+from array import array
+from collections import deque
+
+from lecturer_sentiment_analyzer import categorize_polarity
+
+# Rolling windows (seconds) reported next to the whole-session figures
+LIVE_WINDOWS = (60, 300)
+
+
+class LiveSegment:
+    """One recognized phrase: session-relative start/end seconds, text, token ids and its sentiment"""
+
+    __slots__ = ('start', 'end', 'text', 'token_ids', 'polarity', 'subjectivity')
+
+    def __init__(self, start, end, text, token_ids, polarity=0.0, subjectivity=0.0):
+        self.start = start
+        self.end = end
+        self.text = text
+        self.token_ids = token_ids
+        self.polarity = polarity
+        self.subjectivity = subjectivity
+
+    @property
+    def word_count(self):
+        return len(self.token_ids)
+
+    def to_dict(self):
+        return {
+            'start': round(self.start, 3),
+            'end': round(self.end, 3),
+            'text': self.text,
+            'polarity': float(self.polarity),
+            'subjectivity': float(self.subjectivity)
+        }
+
+
+class RollingWindow:
+    """Pace, filler ratio and sentiment over the last `seconds` of a live session.
+
+    Chunks enter a deque with their end time and leave once that is older
+    than the window, and running sums are adjusted on the way in and out,
+    so each update costs O(1) amortized however long the session runs.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.entries = deque()
+        self.words = 0
+        self.fillers = 0
+        self.polarity_sum = 0.0
+        self.subjectivity_sum = 0.0
+
+    def add(self, end, words, fillers, polarity, subjectivity):
+        self.entries.append((end, words, fillers, polarity * words, subjectivity * words))
+        self.words += words
+        self.fillers += fillers
+        self.polarity_sum += polarity * words
+        self.subjectivity_sum += subjectivity * words
+
+    def expire(self, now):
+        """Drop chunks that ended before the window"""
+        entries = self.entries
+        while entries and entries[0][0] <= now - self.seconds:
+            _, words, fillers, polarity, subjectivity = entries.popleft()
+            self.words -= words
+            self.fillers -= fillers
+            self.polarity_sum -= polarity
+            self.subjectivity_sum -= subjectivity
+        if not entries:
+            # Reset so float error can't accumulate across an idle gap
+            self.polarity_sum = self.subjectivity_sum = 0.0
+
+    def snapshot(self, elapsed):
+        """Figures for the window ending `elapsed` seconds into the session"""
+        self.expire(elapsed)
+        polarity = self.polarity_sum / self.words if self.words else 0.0
+        covered = min(self.seconds, elapsed)
+        return {
+            'word_count': self.words,
+            'speaking_rate': float(self.words / covered * 60) if covered > 0 else 0.0,
+            'filler_ratio': float(self.fillers / self.words) if self.words else 0.0,
+            'polarity': float(polarity),
+            'subjectivity': float(self.subjectivity_sum / self.words) if self.words else 0.0,
+            'category': categorize_polarity(polarity)
+        }
+
+
+class LiveSession:
+    """Running analytics for a live recording.
+
+    Each recognized chunk is tokenized and scored once and folded into
+    running totals, so an update costs time proportional to the chunk rather
+    than to the whole session. Polarity and subjectivity are averaged over
+    chunks weighted by their word counts.
+
+    Alongside the whole-session figures, each RollingWindow (by default the
+    last minute and the last five minutes) tracks recent pace and
+    sentiment, so a bad stretch isn't hidden by the session average.
+
+    Recognized text is kept as an append-only list of LiveSegment records
+    (tokens stored as ids into one shared vocabulary) and only joined into
+    a transcript when asked, so an update never copies the text so far.
+
+    add_chunk() (recognition threads) and snapshot() (request threads) may
+    run at once; a lock keeps the totals and windows consistent between them.
+    """
+
+    def __init__(self, engine, start_time=None, windows=LIVE_WINDOWS):
+        self.engine = engine
+        self.start_time = start_time if start_time is not None else time.time()
+        self.segments = []
+        self.vocabulary = {}
+
+        self.word_count = 0
+        self.filler_count = 0
+        self.content_word_count = 0
+        self.content_words = set()
+        self.polarity_sum = 0.0
+        self.subjectivity_sum = 0.0
+        self.sentiment_weight = 0
+        self.windows = [RollingWindow(seconds) for seconds in windows]
+        self._lock = threading.Lock()
+
+    @property
+    def transcript(self):
+        """Full transcript so far, joined on demand"""
+        return " ".join(segment.text for segment in self.segments)
+
+    def token_ids(self, words):
+        """Ids of words in the session vocabulary, adding new words"""
+        vocabulary = self.vocabulary
+        return array('I', (vocabulary.setdefault(word, len(vocabulary)) for word in words))
+
+    def add_chunk(self, text, now=None, start=None, end=None):
+        """Fold one recognized chunk into the running totals and return the live snapshot.
+
+        start/end are the chunk's offsets in seconds from the session start;
+        by default it is taken to run from the previous chunk's end until now.
+        """
+        text = text.strip()
+        if not text:
+            return self.snapshot(now)
+
+        if end is None:
+            end = (now if now is not None else time.time()) - self.start_time
+
+        # Tokenize and score outside the lock; the engine is read-only
+        words = self.engine.safe_tokenize(text)
+        fillers = self.engine.count_fillers(words)
+        content_words = [w for w in words if w not in self.engine.stop_words and w.isalpha() and len(w) > 2]
+        polarity, subjectivity = self.engine.score_tokens(words) if words else (0.0, 0.0)
+
+        with self._lock:
+            if start is None:
+                start = self.segments[-1].end if self.segments else 0.0
+            segment = LiveSegment(start, end, text, self.token_ids(words), polarity, subjectivity)
+            self.segments.append(segment)
+            self.word_count += len(words)
+            self.filler_count += fillers
+
+            self.content_word_count += len(content_words)
+            self.content_words.update(content_words)
+
+            if words:
+                self.polarity_sum += polarity * len(words)
+                self.subjectivity_sum += subjectivity * len(words)
+                self.sentiment_weight += len(words)
+
+            for window in self.windows:
+                window.add(end, len(words), fillers, polarity, subjectivity)
+
+            return self._snapshot(now)
+
+    @property
+    def polarity(self):
+        return self.polarity_sum / self.sentiment_weight if self.sentiment_weight else 0.0
+
+    @property
+    def subjectivity(self):
+        return self.subjectivity_sum / self.sentiment_weight if self.sentiment_weight else 0.0
+
+    def snapshot(self, now=None):
+        """Current live_sentiment and live_metrics, in the shape stored in results"""
+        with self._lock:
+            return self._snapshot(now)
+
+    def _snapshot(self, now):
+        # Expires old chunks from the windows, so the caller must hold the lock
+        now = now if now is not None else time.time()
+        elapsed_time = now - self.start_time
+        speaking_rate = (self.word_count / elapsed_time) * 60 if elapsed_time > 0 else 0
+        filler_ratio = self.filler_count / self.word_count if self.word_count > 0 else 0
+        vocabulary_richness = (len(self.content_words) / self.content_word_count
+                               if self.content_word_count > 0 else 0)
+
+        return {
+            'live_sentiment': {
+                'category': categorize_polarity(self.polarity),
+                'polarity': float(self.polarity),
+                'subjectivity': float(self.subjectivity)
+            },
+            'live_metrics': {
+                'word_count': self.word_count,
+                'speaking_rate': float(speaking_rate),
+                'filler_count': self.filler_count,
+                'filler_ratio': float(filler_ratio),
+                'unique_words': len(self.content_words),
+                'vocabulary_richness': float(vocabulary_richness),
+                'session_time': float(elapsed_time),
+                'windows': {f"{window.seconds:g}s": window.snapshot(elapsed_time) for window in self.windows}
+            }
+        }
@@ -0,0 +1,104 @@
+import json
+import time
+import threading
+
+
+def format_event(event, data):
+    """One Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def snapshot_delta(previous, snapshot, precision=3):
+    """Fields of a live snapshot (nested dicts) that differ from previous.
+
+    Floats are rounded first so changes below the display precision are
+    not sent.
+    """
+    delta = {}
+    for name, value in snapshot.items():
+        if isinstance(value, dict):
+            sent = previous.get(name)
+            value = snapshot_delta(sent if isinstance(sent, dict) else {}, value, precision)
+            if value:
+                delta[name] = value
+            continue
+        if isinstance(value, float):
+            value = round(value, precision)
+        if name not in previous or previous[name] != value:
+            delta[name] = value
+    return delta
+
+
+def merge_delta(state, delta):
+    """Apply a delta to the state a subscriber has been sent"""
+    for name, value in delta.items():
+        if isinstance(value, dict):
+            merge_delta(state.setdefault(name, {}), value)
+        else:
+            state[name] = value
+    return state
+
+
+class LiveBroadcaster:
+    """Fans live analysis snapshots out to any number of stream subscribers.
+
+    publish() only stores the newest snapshot and wakes the subscribers, so
+    the analysis loop never waits on a client. Each subscriber sends at
+    most `rate` updates per second: snapshots published in between are
+    coalesced into the newest one, and only fields that changed since that
+    subscriber's previous update are sent. A slow client therefore skips
+    intermediate states instead of queueing them. rate=0 sends every
+    update as soon as the subscriber is ready for it.
+    """
+
+    def __init__(self, rate=2.0, keepalive=15.0):
+        self.rate = rate
+        self.keepalive = keepalive
+        self.version = 0
+        self.latest = None
+        self.final = None
+        self.closed = False
+        self.subscribers = 0
+        self._changed = threading.Condition()
+
+    def publish(self, snapshot):
+        with self._changed:
+            self.latest = snapshot
+            self.version += 1
+            self._changed.notify_all()
+
+    def close(self, final=None):
+        """End every stream, sending `final` (e.g. the finished results) as the last event"""
+        with self._changed:
+            self.final = final
+            self.closed = True
+            self._changed.notify_all()
+
+    def subscribe(self):
+        """Generator of SSE messages for one client: full state first, then deltas"""
+        sent, seen = {}, 0
+        with self._changed:
+            self.subscribers += 1
+        try:
+            while True:
+                with self._changed:
+                    self._changed.wait_for(lambda: self.version != seen or self.closed, timeout=self.keepalive)
+                    snapshot, version, closed = self.latest, self.version, self.closed
+                if version != seen and snapshot is not None:
+                    seen = version
+                    delta = snapshot_delta(sent, snapshot)
+                    if delta:
+                        merge_delta(sent, delta)
+                        yield format_event('update', delta)
+                elif not closed:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                if closed:
+                    yield format_event('end', self.final or {})
+                    return
+                # Coalescing window: whatever is published meanwhile is sent as one update
+                if self.rate > 0:
+                    time.sleep(1.0 / self.rate)
+        finally:
+            with self._changed:
+                self.subscribers -= 1
@@ -1,39 +1,208 @@
-from flask import Flask, request, jsonify, render_template_string, send_file
+from flask import (Flask, Request, Response, request, jsonify, render_template_string, send_file, url_for,
+                   stream_with_context)
 import os
 import json
+import time
+import uuid
 import tempfile
+import threading
 from werkzeug.utils import secure_filename
 import logging
 
 # Import our sentiment analyzer
 try:
-    from lecturer_sentiment_analyzer import LecturerSentimentAnalyzer
+    from lecturer_sentiment_analyzer import SentimentEngine, LecturerSentimentAnalyzer, detect_microphone
+    from jobs import JobStore, JobRunner, QUEUED, DONE
+    from transcript_cache import TranscriptCache, HashingFile, file_sha256
+    from recognizer_backends import make_backend, ResilientBackend
+    from audio_decoder import AudioDecoder, DecodeError, PCM_CACHE_DIR
+    from nltk_resources import CACHE_DIR
+    from live_stream import LiveBroadcaster
+    from ingest_session import IngestSession, ChunkError, ChunkOrderError
+    from transcription import failed_requests
     print("✅ Lecturer Sentiment Analyzer imported successfully")
 except ImportError as e:
     print(f"❌ Error: lecturer_sentiment_analyzer.py not found or has errors: {e}")
     print("Please make sure the lecturer_sentiment_analyzer.py file is in the same directory.")
     exit(1)
 
+
+
+class UploadRequest(Request):
+    """Request whose uploaded files are streamed straight into the upload folder.
+
+    Werkzeug's multipart parser writes each file part to the stream returned
+    here in fixed-size chunks, so an upload is never buffered in memory or
+    copied a second time, and is hashed (SHA-256) on the way through. Paths
+    not claimed by the view are removed when the request ends.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upload_paths = []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        upload = tempfile.NamedTemporaryFile(
+            'wb+', suffix=f"_{secure_filename(filename or '') or 'upload'}",
+            dir=app.config['UPLOAD_FOLDER'], delete=False
+        )
+        self.upload_paths.append(upload.name)
+        return HashingFile(upload)
+
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 
 # Configure upload folder
 UPLOAD_FOLDER = tempfile.gettempdir()
 ALLOWED_EXTENSIONS = {'wav', 'mp3', 'ogg', 'm4a', 'flac'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
+# Optional per-deployment filler lexicon (one phrase per line, e.g. regional fillers)
+app.config['FILLER_LEXICON'] = os.environ.get('FILLER_LEXICON')
+# Speech recognition backend ('google', or 'fake' for offline testing) and
+# how many segments of one recording are recognized concurrently
+app.config['RECOGNIZER_BACKEND'] = os.environ.get('RECOGNIZER_BACKEND', 'google')
+app.config['TRANSCRIPTION_WORKERS'] = int(os.environ.get('TRANSCRIPTION_WORKERS', 4))
+# Per-request timeout (seconds), retries after a failed request, and the cap on
+# recognizer requests in flight across all jobs
+app.config['RECOGNIZER_TIMEOUT'] = float(os.environ.get('RECOGNIZER_TIMEOUT', 15))
+app.config['RECOGNIZER_RETRIES'] = int(os.environ.get('RECOGNIZER_RETRIES', 3))
+app.config['RECOGNIZER_CONCURRENCY'] = int(os.environ.get('RECOGNIZER_CONCURRENCY', 8))
+# Provider quota in requests per second (0 = no limit); requests wait for a slot instead of failing
+app.config['RECOGNIZER_RATE_LIMIT'] = float(os.environ.get('RECOGNIZER_RATE_LIMIT', 0))
+
+# Background analysis jobs: state is kept in SQLite so it survives restarts
+app.config['JOB_DATABASE'] = os.environ.get('JOB_DATABASE', os.path.join(CACHE_DIR, 'jobs.sqlite3'))
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))
+app.config['MAX_QUEUED_JOBS'] = int(os.environ.get('MAX_QUEUED_JOBS', 100))
+# ffmpeg subprocesses decoding uploads at once, and size bound of the decoded-audio cache
+app.config['DECODER_PROCESSES'] = int(os.environ.get('DECODER_PROCESSES', 2))
+app.config['PCM_CACHE_DIR'] = os.environ.get('PCM_CACHE_DIR', PCM_CACHE_DIR)
+app.config['PCM_CACHE_MB'] = int(os.environ.get('PCM_CACHE_MB', 1024))
+# Results cache keyed by audio hash, so re-uploaded recordings skip transcription (0 MB disables)
+app.config['TRANSCRIPT_CACHE'] = os.environ.get('TRANSCRIPT_CACHE', os.path.join(CACHE_DIR, 'transcripts.sqlite3'))
+app.config['TRANSCRIPT_CACHE_MB'] = int(os.environ.get('TRANSCRIPT_CACHE_MB', 256))
+# Worker processes for the CPU-bound text analysis (0 = analyze on the job thread)
+app.config['ANALYSIS_PROCESSES'] = int(os.environ.get('ANALYSIS_PROCESSES', min(2, os.cpu_count() or 1)))
+# Most live updates per second sent to each stream subscriber; faster updates are coalesced (0 = no limit)
+app.config['LIVE_UPDATE_RATE'] = float(os.environ.get('LIVE_UPDATE_RATE', 2))
+# Rolling windows (seconds, comma-separated) for recent pace and sentiment in live metrics
+app.config['LIVE_WINDOWS'] = tuple(float(seconds) for seconds in os.environ.get('LIVE_WINDOWS', '60,300').split(','))
+# Chunked ingest sessions with no new chunk for this many seconds are discarded
+app.config['INGEST_IDLE_TIMEOUT'] = float(os.environ.get('INGEST_IDLE_TIMEOUT', 300))
+
+
+def recognizer_options():
+    """Connection pool and rate limit settings for the remote recognizer"""
+    if app.config['RECOGNIZER_BACKEND'] != 'google':
+        return {}
+    return {
+        'pool_size': app.config['RECOGNIZER_CONCURRENCY'],
+        'rate_limit': app.config['RECOGNIZER_RATE_LIMIT'] or None
+    }
+
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create an instance of our analyzer
+# Create one shared engine; every request gets its own result object from it
 try:
-    analyzer = LecturerSentimentAnalyzer()
+    analyzer = SentimentEngine(
+        filler_lexicon=app.config['FILLER_LEXICON'],
+        recognizer_backend=ResilientBackend(
+            make_backend(app.config['RECOGNIZER_BACKEND'], **recognizer_options()),
+            timeout=app.config['RECOGNIZER_TIMEOUT'],
+            retries=app.config['RECOGNIZER_RETRIES'],
+            max_concurrent=app.config['RECOGNIZER_CONCURRENCY']
+        ),
+        transcription_workers=app.config['TRANSCRIPTION_WORKERS'],
+        decoder=AudioDecoder(
+            cache_dir=app.config['PCM_CACHE_DIR'],
+            max_bytes=app.config['PCM_CACHE_MB'] * 1024 * 1024,
+            processes=app.config['DECODER_PROCESSES']
+        )
+    )
     logger.info("✅ Lecturer Sentiment Analyzer initialized successfully")
 except Exception as e:
     logger.error(f"❌ Failed to initialize analyzer: {e}")
     analyzer = None
 
+mic_available = detect_microphone() is not None
+
+# Process pool so text analysis doesn't hold the GIL on job threads. Not started
+# at import: importing processes (the debug reloader's watcher, tooling) must not
+# fork workers. See start_background_services()
+analysis_pool = None
+
+
+def start_analysis_pool():
+    """Fork the text analysis workers; call while the process is still single-threaded"""
+    global analysis_pool
+    if analysis_pool is not None or not analyzer or app.config['ANALYSIS_PROCESSES'] <= 0:
+        return
+    try:
+        from worker_pool import AnalysisPool
+        analysis_pool = AnalysisPool(
+            processes=app.config['ANALYSIS_PROCESSES'],
+            engine_kwargs={'filler_lexicon': app.config['FILLER_LEXICON']},
+            fallback_engine=analyzer
+        )
+        analysis_pool.warm_up()
+    except Exception as e:
+        logger.error(f"❌ Failed to start analysis pool, analyzing in-process: {e}")
+        analysis_pool = None
+
+
+transcript_cache = None
+if app.config['TRANSCRIPT_CACHE_MB'] > 0:
+    transcript_cache = TranscriptCache(app.config['TRANSCRIPT_CACHE'],
+                                       max_bytes=app.config['TRANSCRIPT_CACHE_MB'] * 1024 * 1024)
+
+
+def run_analysis_job(job_id, file_path, set_stage):
+    """Background job body: transcribe and analyze one uploaded file"""
+    if not analyzer:
+        raise RuntimeError('Analyzer not initialized properly')
+    audio_hash = job_store.get(job_id)['audio_hash']
+    results = analyzer.run_analysis_from_file(
+        file_path,
+        text_analyzer=analysis_pool.analyze_text if analysis_pool else None,
+        on_stage=set_stage,
+        audio_hash=audio_hash
+    )
+    # Only complete transcriptions are worth reusing: results with segments whose
+    # requests failed would otherwise be served from the cache with the gaps forever
+    if transcript_cache and 'segments' in results and not failed_requests(results['segments']):
+        audio_hash = audio_hash or file_sha256(file_path)
+        transcript_cache.put(TranscriptCache.make_key(audio_hash, analyzer.fingerprint), results)
+    logger.info(f"Analysis job {job_id} completed")
+    return results
+
+
+job_store = JobStore(app.config['JOB_DATABASE'])
+job_runner = JobRunner(job_store, run_analysis_job,
+                       workers=app.config['JOB_WORKERS'],
+                       max_queued=app.config['MAX_QUEUED_JOBS'])
+
+
+# Live sessions by id: the analyzer recording the session and the broadcaster streaming its updates
+live_sessions = {}
+live_sessions_lock = threading.Lock()
+
+
+def run_microphone_session(session_id, session, broadcaster):
+    """Background thread: record from the server microphone until stopped, then end the stream"""
+    try:
+        session.start_live_recording()
+    except Exception as e:
+        logger.error(f"Live session {session_id} failed: {e}")
+    finally:
+        broadcaster.close(final=dict(session.results))
+        with live_sessions_lock:
+            live_sessions.pop(session_id, None)
+
 
 def allowed_file(filename):
     """Check if the uploaded file has an allowed extension"""
@@ -119,7 +288,7 @@ HTML_TEMPLATE = """
                                 <div class="spinner-border text-primary mb-2" role="status">
                                     <span class="visually-hidden">Processing...</span>
                                 </div>
-                                <p class="mb-0">Processing your audio file... This may take a few minutes.</p>
+                                <p id="progressMessage" class="mb-0">Processing your audio file... This may take a few minutes.</p>
                             </div>
                         </div>
                     </div>
@@ -288,8 +457,8 @@ HTML_TEMPLATE = """
                     contentType: false,
                     processData: false,
                     success: function(response) {
-                        $('#uploadProgress').addClass('d-none');
-                        displayResults(response);
+                        // Analysis runs in the background; poll until the job finishes
+                        pollJob(response.status_url);
                     },
                     error: function(xhr, status, error) {
                         $('#uploadProgress').addClass('d-none');
@@ -314,6 +483,31 @@ HTML_TEMPLATE = """
             });
         });
 
+        const STAGE_MESSAGES = {
+            queued: 'Waiting for a free analysis worker...',
+            running: 'Starting analysis...',
+            transcribing: 'Transcribing your lecture... This may take a few minutes.',
+            analyzing: 'Analyzing sentiment and speaking metrics...'
+        };
+
+        function pollJob(statusUrl) {
+            $.get(statusUrl, function(job) {
+                if (job.status === 'done') {
+                    $('#uploadProgress').addClass('d-none');
+                    displayResults(job.result);
+                } else if (job.status === 'failed') {
+                    $('#uploadProgress').addClass('d-none');
+                    showError('Analysis failed: ' + (job.error || 'unknown error'));
+                } else {
+                    $('#progressMessage').text(STAGE_MESSAGES[job.stage] || 'Processing your audio file...');
+                    setTimeout(function() { pollJob(statusUrl); }, 2000);
+                }
+            }).fail(function(xhr, status, error) {
+                $('#uploadProgress').addClass('d-none');
+                showError('Could not get analysis status: ' + (xhr.responseJSON?.error || error));
+            });
+        }
+
         function checkSystemStatus() {
             $.get('/api/health', function(response) {
                 if (!response.analyzer_ready) {
@@ -386,7 +580,7 @@ def index():
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze_audio():
-    """API endpoint to analyze an uploaded audio file"""
+    """API endpoint to queue analysis of an uploaded audio file"""
     if not analyzer:
         return jsonify({'error': 'Analyzer not initialized properly'}), 500
 
@@ -402,26 +596,42 @@ def analyze_audio():
 
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        # Already on disk: the request class streamed the upload into the
+        # upload folder under a unique name. It is deleted when the job finishes.
+        file_path = file.stream.name
+        file.stream.close()
+        request.upload_paths.remove(file_path)
+        audio_hash = file.stream.hexdigest()
+        logger.info(f"File saved: {file_path}")
 
         try:
-            # Save the uploaded file
-            file.save(file_path)
-            logger.info(f"File saved: {file_path}")
-
-            # Run analysis on the saved file
-            results = analyzer.run_analysis_from_file(file_path)
-
-            # Clean up - delete the temporary file
-            if os.path.exists(file_path):
+            # A recording analyzed before is answered from the cache without transcribing
+            cached = None
+            if transcript_cache:
+                cached = transcript_cache.get(TranscriptCache.make_key(audio_hash, analyzer.fingerprint))
+            if cached is not None:
+                os.remove(file_path)
+                job_id = job_store.create(filename, None, audio_hash)
+                job_store.update(job_id, status=DONE, stage=DONE, result=cached)
+                logger.info(f"Analysis served from cache: {job_id}")
+                return jsonify({
+                    'job_id': job_id,
+                    'status': DONE,
+                    'status_url': url_for('get_job', job_id=job_id)
+                }), 200
+
+            # Queue the analysis and return immediately; clients poll /api/jobs/<id>
+            job_id = job_runner.submit(filename, file_path, audio_hash)
+            if job_id is None:
                 os.remove(file_path)
-                logger.info(f"Temporary file deleted: {file_path}")
+                return jsonify({'error': 'Server is busy. Please try again shortly.'}), 503
 
-            if results:
-                logger.info("Analysis completed successfully")
-                return jsonify(results)
-            else:
-                return jsonify({'error': 'Analysis failed - no results generated'}), 500
+            logger.info(f"Analysis job queued: {job_id}")
+            return jsonify({
+                'job_id': job_id,
+                'status': QUEUED,
+                'status_url': url_for('get_job', job_id=job_id)
+            }), 202
 
         except Exception as e:
             logger.error(f"Analysis error: {str(e)}")
@@ -433,6 +643,184 @@ def analyze_audio():
     return jsonify({'error': 'Invalid file type. Please upload WAV, MP3, OGG, M4A, or FLAC files.'}), 400
 
 
+@app.teardown_request
+def remove_unclaimed_uploads(error=None):
+    """Delete streamed uploads the view didn't hand to a job (rejected or failed requests)"""
+    for path in getattr(request, 'upload_paths', ()):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Report status, current stage and (when done) the result of an analysis job"""
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    return jsonify({
+        'job_id': job['id'],
+        'status': job['status'],
+        'stage': job['stage'],
+        'filename': job['filename'],
+        'created': job['created'],
+        'updated': job['updated'],
+        'result': job['result'],
+        'error': job['error']
+    })
+
+
+@app.route('/api/live', methods=['POST'])
+def start_live_session():
+    """Start a live analysis session recording from the server's microphone"""
+    if not analyzer:
+        return jsonify({'error': 'Analyzer not initialized properly'}), 500
+    if not mic_available:
+        return jsonify({'error': 'No microphone available on the server'}), 409
+
+    with live_sessions_lock:
+        if any(isinstance(session, LecturerSentimentAnalyzer) and session.is_recording
+               for session, _ in live_sessions.values()):
+            return jsonify({'error': 'A live session is already recording'}), 409
+        session_id = uuid.uuid4().hex
+        session = LecturerSentimentAnalyzer(engine=analyzer)
+        broadcaster = LiveBroadcaster(rate=app.config['LIVE_UPDATE_RATE'])
+        session.on_live_update = broadcaster.publish
+        session.live_windows = app.config['LIVE_WINDOWS']
+        # Set before the thread starts so a concurrent request sees the microphone as taken
+        session.is_recording = True
+        live_sessions[session_id] = (session, broadcaster)
+
+    threading.Thread(target=run_microphone_session, args=(session_id, session, broadcaster),
+                     name=f"live-{session_id[:8]}", daemon=True).start()
+    return jsonify({
+        'session_id': session_id,
+        'stream_url': url_for('stream_live_session', session_id=session_id)
+    }), 201
+
+
+@app.route('/api/live/<session_id>/stream')
+def stream_live_session(session_id):
+    """Server-Sent Events: the full live snapshot, then changed fields only, then the final results"""
+    with live_sessions_lock:
+        entry = live_sessions.get(session_id)
+    if entry is None:
+        return jsonify({'error': 'Unknown live session'}), 404
+
+    _, broadcaster = entry
+    return Response(stream_with_context(broadcaster.subscribe()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/live/<session_id>/stop', methods=['POST'])
+def stop_live_session(session_id):
+    """Stop recording; the final results are sent to stream subscribers when analysis finishes"""
+    with live_sessions_lock:
+        entry = live_sessions.get(session_id)
+    if entry is None:
+        return jsonify({'error': 'Unknown live session'}), 404
+
+    session, _ = entry
+    session.is_recording = False
+    return jsonify({'session_id': session_id, 'status': 'stopping'}), 202
+
+
+def discard_idle_ingest_sessions():
+    """Abort chunked ingest sessions the browser stopped sending to"""
+    cutoff = time.monotonic() - app.config['INGEST_IDLE_TIMEOUT']
+    with live_sessions_lock:
+        idle = [(session_id, session, broadcaster) for session_id, (session, broadcaster) in live_sessions.items()
+                if isinstance(session, IngestSession) and session.last_activity < cutoff]
+        for session_id, _, _ in idle:
+            del live_sessions[session_id]
+    for session_id, session, broadcaster in idle:
+        logger.info(f"Discarding idle ingest session {session_id}")
+        session.abort()
+        broadcaster.close()
+
+
+def reap_idle_ingest_sessions(interval=30.0):
+    """Background loop so abandoned sessions are discarded even when no ingest requests arrive"""
+    while True:
+        time.sleep(interval)
+        try:
+            discard_idle_ingest_sessions()
+        except Exception as e:
+            logger.error(f"❌ Failed to discard idle ingest sessions: {e}")
+
+
+def get_ingest_session(session_id):
+    with live_sessions_lock:
+        session, _ = live_sessions.get(session_id, (None, None))
+    return session if isinstance(session, IngestSession) else None
+
+
+@app.route('/api/ingest', methods=['POST'])
+def start_ingest_session():
+    """Start a session that receives a lecture in short chunks while it is recorded (e.g. by MediaRecorder)"""
+    if not analyzer:
+        return jsonify({'error': 'Analyzer not initialized properly'}), 500
+
+    broadcaster = LiveBroadcaster(rate=app.config['LIVE_UPDATE_RATE'])
+    session = IngestSession(analyzer, sample_rate=request.args.get('rate', 16000, type=int),
+                            on_update=broadcaster.publish, windows=app.config['LIVE_WINDOWS'])
+    session_id = uuid.uuid4().hex
+    with live_sessions_lock:
+        live_sessions[session_id] = (session, broadcaster)
+    return jsonify({
+        'session_id': session_id,
+        'chunk_url': url_for('add_ingest_chunk', session_id=session_id),
+        'finish_url': url_for('finish_ingest_session', session_id=session_id),
+        'stream_url': url_for('stream_live_session', session_id=session_id)
+    }), 201
+
+
+@app.route('/api/ingest/<session_id>/chunks', methods=['POST'])
+def add_ingest_chunk(session_id):
+    """Accept the next chunk (request body; Content-Type audio/wav, audio/l16, audio/webm or audio/ogg)"""
+    session = get_ingest_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Unknown ingest session'}), 404
+
+    try:
+        session.add_chunk(request.get_data(), request.content_type, request.args.get('seq', type=int))
+    except ChunkOrderError as e:
+        return jsonify({'error': str(e)}), 409
+    except ChunkError as e:
+        return jsonify({'error': str(e)}), 400
+    except DecodeError as e:
+        return jsonify({'error': str(e)}), 415
+    return jsonify({
+        'session_id': session_id,
+        'chunks': session.chunks,
+        'audio_seconds': round(session.audio_seconds, 3),
+        'live': session.live.snapshot(now=session.audio_seconds)
+    }), 202
+
+
+@app.route('/api/ingest/<session_id>/finish', methods=['POST'])
+def finish_ingest_session(session_id):
+    """Analyze what was received; the results are stored as a finished job and sent to stream subscribers"""
+    session = get_ingest_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Unknown ingest session'}), 404
+
+    results = session.finish()
+    job_id = job_store.create(f"live-{session_id[:8]}", None)
+    job_store.update(job_id, status=DONE, stage=DONE, result=results)
+    with live_sessions_lock:
+        _, broadcaster = live_sessions.pop(session_id, (None, None))
+    if broadcaster is not None:
+        broadcaster.close(final=results)
+    logger.info(f"Ingest session {session_id} finished as job {job_id}")
+    return jsonify({
+        'job_id': job_id,
+        'status': DONE,
+        'status_url': url_for('get_job', job_id=job_id),
+        'result': results
+    }), 200
+
+
 @app.route('/api/health')
 def health_check():
     """Health check endpoint"""
@@ -440,7 +828,12 @@ def health_check():
         'status': 'healthy',
         'analyzer_ready': analyzer is not None,
         'upload_folder': app.config['UPLOAD_FOLDER'],
-        'mic_available': analyzer.mic_available if analyzer else False
+        'mic_available': mic_available,
+        'analysis_processes': analysis_pool.processes if analysis_pool else 0,
+        'pending_jobs': job_runner.pending,
+        'live_sessions': len(live_sessions),
+        'transcript_cache': transcript_cache.stats() if transcript_cache else None,
+        'recognizer': analyzer.recognizer_backend.stats() if analyzer else None
     })
 
 
@@ -457,6 +850,18 @@ def internal_server_error(error):
     return jsonify({'error': 'Internal server error occurred'}), 500
 
 
+def start_background_services():
+    """Start the work that must run once per serving process, not per import.
+
+    Called by the __main__ block below; other WSGI servers should call it
+    once in each worker process, e.g. from gunicorn's post_worker_init hook.
+    """
+    start_analysis_pool()
+    job_runner.resume()
+    threading.Thread(target=reap_idle_ingest_sessions, args=(min(30.0, app.config['INGEST_IDLE_TIMEOUT']),),
+                     name='ingest-reaper', daemon=True).start()
+
+
 if __name__ == '__main__':
     # Create upload folder if it doesn't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -467,7 +872,7 @@ if __name__ == '__main__':
     print(f"📁 Upload folder: {app.config['UPLOAD_FOLDER']}")
     print(f"🔧 Analyzer status: {'✅ Ready' if analyzer else '❌ Not initialized'}")
     if analyzer:
-        print(f"🎤 Microphone: {'✅ Available' if analyzer.mic_available else '❌ Not available'}")
+        print(f"🎤 Microphone: {'✅ Available' if mic_available else '❌ Not available'}")
     print("=" * 60)
     print("📋 Instructions:")
     print("   1. Open http://localhost:5000 in your browser")
@@ -475,5 +880,10 @@ if __name__ == '__main__':
     print("   3. View analysis results and feedback")
     print("=" * 60)
 
-    # Start the Flask app
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # The debug reloader runs this block in a file-watching parent too; only
+    # the child it restarts (WERKZEUG_RUN_MAIN set) serves requests
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_services()
+
+    # Start the Flask app; requests are served concurrently from the shared engine
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file
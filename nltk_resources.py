@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import nltk
+
+
+# NLTK packages the analyzer needs, mapped to their nltk.data lookup paths
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',                                      # Tokenizer
+    'stopwords': 'corpora/stopwords',                                 # Stopwords corpus
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',  # POS tagger
+}
+
+# Bump when NLTK_RESOURCES changes so stale readiness markers are ignored
+RESOURCE_SET_VERSION = 1
+
+CACHE_DIR = os.environ.get(
+    'LSA_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'lecturer_sentiment_analyzer')
+)
+READY_MARKER = os.path.join(CACHE_DIR, 'nltk_ready.json')
+
+
+def _marker_header():
+    """Fields a readiness marker must match to be trusted"""
+    return {
+        'version': RESOURCE_SET_VERSION,
+        'nltk_version': nltk.__version__,
+        'resources': sorted(NLTK_RESOURCES),
+    }
+
+
+def _read_marker(marker_path):
+    """Return the marker contents, or None if it is missing or stale"""
+    try:
+        with open(marker_path) as f:
+            marker = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    header = _marker_header()
+    if any(marker.get(key) != value for key, value in header.items()):
+        return None
+
+    # A stat per resource is enough to notice that nltk_data was removed
+    locations = marker.get('locations', {})
+    if not all(os.path.exists(locations.get(name, '')) for name in NLTK_RESOURCES):
+        return None
+    return marker
+
+
+def _write_marker(marker_path, locations):
+    """Atomically write a readiness marker for the located resources"""
+    marker = _marker_header()
+    marker['locations'] = locations
+    marker['created'] = time.time()
+    try:
+        os.makedirs(os.path.dirname(marker_path), exist_ok=True)
+        tmp_path = f"{marker_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(marker, f, indent=2)
+        os.replace(tmp_path, marker_path)
+    except OSError as e:
+        print(f"⚠️  Could not write NLTK readiness marker: {e}")
+
+
+def locate_nltk_resources():
+    """Find each resource in the local nltk_data paths without using the network"""
+    locations = {}
+    for name, lookup in NLTK_RESOURCES.items():
+        try:
+            locations[name] = str(nltk.data.find(lookup))
+        except LookupError:
+            locations[name] = None
+    return locations
+
+
+def ensure_nltk_resources(marker_path=READY_MARKER):
+    """Check that NLTK resources are available locally.
+
+    This is safe to call on the startup path: it trusts a valid readiness
+    marker, otherwise scans nltk_data once. It never downloads anything;
+    use prefetch_nltk_resources() (or `python nltk_resources.py prefetch`)
+    for that. Returns a dict of resource name -> available.
+    """
+    if _read_marker(marker_path) is not None:
+        return {name: True for name in NLTK_RESOURCES}
+
+    locations = locate_nltk_resources()
+    missing = [name for name, path in locations.items() if path is None]
+
+    if missing:
+        for name in missing:
+            print(f"⚠️  NLTK {name} not found locally; run `python nltk_resources.py prefetch`")
+    else:
+        _write_marker(marker_path, locations)
+
+    return {name: path is not None for name, path in locations.items()}
+
+
+def prefetch_nltk_resources(download_dir=None, marker_path=READY_MARKER):
+    """Download all required NLTK resources and write the readiness marker"""
+    for name in NLTK_RESOURCES:
+        try:
+            if nltk.download(name, download_dir=download_dir, quiet=True):
+                print(f"✅ NLTK {name} downloaded/available")
+            else:
+                print(f"⚠️  Could not download {name}")
+        except Exception as e:
+            print(f"⚠️  Could not download {name}: {e}")
+            # Continue with other resources
+
+    if download_dir and download_dir not in nltk.data.path:
+        nltk.data.path.insert(0, download_dir)
+
+    # Force a fresh scan so the marker reflects what is on disk now
+    if os.path.exists(marker_path):
+        os.remove(marker_path)
+    return ensure_nltk_resources(marker_path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage NLTK resources for the analyzer")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    prefetch_parser = subparsers.add_parser('prefetch', help="Download resources (e.g. during image builds)")
+    prefetch_parser.add_argument('--download-dir', default=None, help="Target nltk_data directory")
+    subparsers.add_parser('check', help="Report local availability without using the network")
+
+    args = parser.parse_args()
+
+    if args.command == 'prefetch':
+        status = prefetch_nltk_resources(download_dir=args.download_dir)
+    else:
+        status = ensure_nltk_resources()
+
+    for name, available in status.items():
+        print(f"{'✅' if available else '❌'} {name}")
+    sys.exit(0 if all(status.values()) else 1)
@@ -0,0 +1,70 @@
+import os
+import json
+import time
+import threading
+import speech_recognition as sr
+
+from audio_processing import PcmAudio, frame_rms, noise_floor, MIN_ENERGY_THRESHOLD, NOISE_THRESHOLD_RATIO
+from nltk_resources import CACHE_DIR
+
+NOISE_PROFILES = os.path.join(CACHE_DIR, 'noise_profiles.json')
+
+# Re-measure a device's room noise after this long
+PROFILE_MAX_AGE = 7 * 24 * 3600
+
+
+def microphone_key(microphone):
+    """Identify a microphone across sessions by name, index and sample rate"""
+    index = getattr(microphone, 'device_index', None)
+    name = 'default'
+    if index is not None:
+        try:
+            name = sr.Microphone.list_microphone_names()[index]
+        except (OSError, AttributeError, IndexError):
+            pass
+    return f"{name}|{index}|{getattr(microphone, 'SAMPLE_RATE', '')}"
+
+
+def measure_noise_profile(audio_data, frame_ms=30):
+    """Noise floor and speech threshold from a recording of room noise alone"""
+    pcm = PcmAudio.from_audio_data(audio_data)
+    rms = frame_rms(pcm.samples, max(1, int(pcm.sample_rate * frame_ms / 1000)))
+    floor = noise_floor(rms, percentile=50)
+    return {
+        'noise_floor': round(floor, 1),
+        'energy_threshold': round(max(MIN_ENERGY_THRESHOLD, floor * NOISE_THRESHOLD_RATIO), 1),
+        'measured': time.time()
+    }
+
+
+class NoiseProfileStore:
+    """Noise profiles per microphone, kept in a JSON file between sessions"""
+
+    def __init__(self, path=NOISE_PROFILES, max_age=PROFILE_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, device_key):
+        """The saved profile for a device, or None if missing or stale"""
+        profile = self._load().get(device_key)
+        if profile and time.time() - profile.get('measured', 0) <= self.max_age:
+            return profile
+        return None
+
+    def save(self, device_key, profile):
+        with self._lock:
+            profiles = self._load()
+            profiles[device_key] = profile
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(profiles, f, indent=2)
+            os.replace(tmp_path, self.path)
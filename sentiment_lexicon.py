@@ -0,0 +1,310 @@
+import os
+import time
+import struct
+import numpy as np
+from importlib import metadata
+from textblob.en import sentiment as pattern_sentiment
+
+from nltk_resources import CACHE_DIR
+
+# Compiled lexicon written by `python sentiment_lexicon.py compile`
+COMPILED_LEXICON = os.path.join(CACHE_DIR, 'en-sentiment.lex')
+
+# File layout: header, then each array back to back, then the words as
+# newline-separated UTF-8. Float arrays come first so they stay 8-byte aligned.
+LEXICON_MAGIC = b'LSALEX01'
+LEXICON_HEADER = struct.Struct('<8sII64s')  # magic, word count, words byte length, source signature
+ARRAY_FIELDS = (
+    ('polarity', np.float64),
+    ('subjectivity', np.float64),
+    ('intensity', np.float64),
+    ('is_modifier', np.bool_),
+    ('is_known', np.bool_),
+    ('is_negation', np.bool_),
+    ('is_exclamation', np.bool_),
+    ('ends_ly', np.bool_),
+)
+
+
+def source_signature():
+    """Identify the TextBlob lexicon a compiled file was built from"""
+    try:
+        version = metadata.version('textblob')
+    except metadata.PackageNotFoundError:
+        version = 'unknown'
+    try:
+        size = os.path.getsize(pattern_sentiment.path)
+    except OSError:
+        size = 0
+    return f"textblob-{version}:{size}".encode('ascii')
+
+
+class PatternLexicon:
+    """TextBlob's pattern sentiment lexicon as NumPy arrays, for batch scoring.
+
+    Words map to integer ids; id 0 is "not in the lexicon". Each array is
+    indexed by id. Negation words and '!' get ids too, even though they
+    carry no scores, so the batch scorer can find them with array ops.
+
+    A lexicon can be saved to a compact binary file and loaded back with
+    mmap. Loaded score and flag arrays are read-only views onto the file,
+    so worker processes on a host share their physical pages; the word
+    list and the vocabulary dict are still built in each process.
+    """
+
+    def __init__(self, words, **arrays):
+        self.words = list(words)
+        self.vocabulary = {word: i for i, word in enumerate(self.words)}
+        for name, dtype in ARRAY_FIELDS:
+            setattr(self, name, np.asarray(arrays[name], dtype=dtype))
+
+    @classmethod
+    def from_textblob(cls):
+        """Build the arrays from TextBlob's bundled en-sentiment.xml (parses the XML)"""
+        # Membership test triggers the lazy XML load
+        'good' in pattern_sentiment
+        negations = tuple(pattern_sentiment.negations)
+
+        words, polarity, subjectivity, intensity, is_modifier = [''], [0.0], [0.0], [1.0], [False]
+        for word, senses in dict.items(pattern_sentiment):
+            # Tokens are single words; multi-word forms can never match one token
+            if ' ' in word or word in negations:
+                continue
+            p, s, i = senses[None]
+            words.append(word)
+            polarity.append(p)
+            subjectivity.append(s)
+            intensity.append(i)
+            is_modifier.append(any(pos in senses for pos in pattern_sentiment.modifiers))
+
+        for marker in negations + ('!',):
+            words.append(marker)
+            polarity.append(0.0)
+            subjectivity.append(0.0)
+            intensity.append(1.0)
+            is_modifier.append(False)
+
+        # Scored entries vs. the markers the scorer also needs to see
+        is_known = [i > 0 and word not in negations and word != '!' for i, word in enumerate(words)]
+
+        return cls(
+            words,
+            polarity=polarity,
+            subjectivity=subjectivity,
+            intensity=intensity,
+            is_modifier=is_modifier,
+            is_known=is_known,
+            is_negation=[word in negations for word in words],
+            is_exclamation=[word == '!' for word in words],
+            ends_ly=[word.endswith('ly') for word in words],
+        )
+
+    def save(self, path):
+        """Write the compiled binary lexicon atomically"""
+        words_blob = '\n'.join(self.words).encode('utf-8')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(LEXICON_HEADER.pack(LEXICON_MAGIC, len(self.words), len(words_blob), source_signature()))
+                for name, dtype in ARRAY_FIELDS:
+                    f.write(np.ascontiguousarray(getattr(self, name), dtype=dtype).tobytes())
+                f.write(words_blob)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a compiled lexicon. Raises ValueError if the file is invalid or stale"""
+        raw = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(raw) < LEXICON_HEADER.size:
+            raise ValueError(f"{path} is truncated")
+        magic, n_words, words_nbytes, signature = LEXICON_HEADER.unpack_from(raw)
+        if magic != LEXICON_MAGIC:
+            raise ValueError(f"{path} is not a compiled lexicon")
+        if signature.rstrip(b'\0') != source_signature():
+            raise ValueError(f"{path} was compiled from a different TextBlob lexicon")
+
+        arrays = {}
+        offset = LEXICON_HEADER.size
+        for name, dtype in ARRAY_FIELDS:
+            nbytes = n_words * np.dtype(dtype).itemsize
+            arrays[name] = raw[offset:offset + nbytes].view(dtype)
+            offset += nbytes
+        if len(raw) != offset + words_nbytes:
+            raise ValueError(f"{path} has an unexpected size")
+
+        words = bytes(raw[offset:offset + words_nbytes]).decode('utf-8').split('\n')
+        return cls(words, **arrays)
+
+    def encode(self, tokens):
+        """Map lowercased tokens to lexicon ids (0 for unknown)"""
+        get = self.vocabulary.get
+        return np.fromiter((get(token, 0) for token in tokens), dtype=np.int32, count=len(tokens))
+
+
+def _previous_index(mask, positions):
+    """For each position, the index of the latest position at or before it where mask is set (-1 if none)"""
+    marked = np.where(mask, positions, -1)
+    return np.maximum.accumulate(marked) if len(marked) else marked
+
+
+def score_batch(lexicon, token_lists):
+    """Polarity and subjectivity for many token lists at once.
+
+    Re-implements pattern's assessment rules with array operations over the
+    concatenated token stream:
+
+    - known words are scored from the lexicon;
+    - a known word following a modifier (e.g. "very good") merges into the
+      modifier's assessment, scaled by the modifier's intensity; modifiers
+      carry across unknown words of one or two letters;
+    - "no", "not", "n't" and "never" negate the next known word (carrying
+      across one-letter tokens), halving and flipping its polarity and
+      inverting its intensity; "really not good" negates the modifier;
+    - each '!' boosts the polarity of the preceding assessment by 25%.
+
+    Emoticons and the "(!)" irony mark are not handled; transcripts from
+    speech recognition never contain them. Otherwise scores equal
+    TextBlob's scoring of the same tokens to within 1e-9 (floating-point
+    summation order). Against TextBlob(text).sentiment, the only further
+    difference comes from tokenization: NLTK splits contractions
+    ("isn't" -> "is", "n't") where pattern's tokenizer does not.
+
+    Returns two float arrays (polarity, subjectivity), one entry per list.
+    """
+    n_docs = len(token_lists)
+    lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=n_docs)
+    polarity_out = np.zeros(n_docs)
+    subjectivity_out = np.zeros(n_docs)
+    if n_docs == 0 or lengths.sum() == 0:
+        return polarity_out, subjectivity_out
+
+    tokens = [token for token_list in token_lists for token in token_list]
+    ids = lexicon.encode(tokens)
+    doc = np.repeat(np.arange(n_docs), lengths)
+    positions = np.arange(len(ids))
+    doc_start = np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+    known = lexicon.is_known[ids]
+    negation = lexicon.is_negation[ids]
+    exclamation = lexicon.is_exclamation[ids]
+    token_len = np.fromiter(map(len, tokens), dtype=np.int32, count=len(tokens))
+    stripped_len = np.fromiter((len(t.strip("'")) for t in tokens), dtype=np.int32, count=len(tokens))
+
+    # Most recent known word before each token (same document only)
+    prev_known = np.empty_like(positions)
+    prev_known[0] = -1
+    prev_known[1:] = _previous_index(known, positions)[:-1]
+    prev_known[prev_known < doc_start] = -1
+    has_prev_known = prev_known >= 0
+    prev_ids = np.where(has_prev_known, ids[np.maximum(prev_known, 0)], 0)
+
+    def modifier_active(blockers):
+        # Modifier carries from the previous known word unless a blocker sits in between
+        last_blocker = np.empty_like(positions)
+        last_blocker[0] = -1
+        last_blocker[1:] = _previous_index(blockers, positions)[:-1]
+        return has_prev_known & lexicon.is_modifier[prev_ids] & (last_blocker < prev_known)
+
+    # Unknown words longer than two characters drop a pending modifier...
+    long_unknown = ~known & (token_len > 2)
+    # ...except a negation right after an -ly modifier ("really not good"),
+    # which negates the modifier's assessment instead. Such negations keep
+    # the modifier alive, so "really not never" needs one round per negation.
+    ly_negation = np.zeros_like(known)
+    while True:
+        m_active = modifier_active(long_unknown & ~ly_negation)
+        updated = negation & m_active & lexicon.ends_ly[prev_ids]
+        if np.array_equal(updated, ly_negation):
+            break
+        ly_negation = updated
+
+    # Pending negation: the latest "event" before a known word must be a negation.
+    # Known words and unknown words longer than one letter clear it.
+    events = known | negation | (~known & (stripped_len > 1))
+    last_event = np.empty_like(positions)
+    last_event[0] = -1
+    last_event[1:] = _previous_index(events, positions)[:-1]
+    has_event = last_event >= doc_start
+    negated_at = known & has_event & (negation & ~ly_negation)[np.maximum(last_event, 0)]
+
+    # Group known words into assessments: a known word starts a new one unless merged
+    known_pos = positions[known]
+    starts = ~m_active[known_pos]
+    group = np.cumsum(starts) - 1
+    n_groups = group[-1] + 1 if len(group) else 0
+    if n_groups == 0:
+        return polarity_out, subjectivity_out
+
+    group_first = np.flatnonzero(starts)
+    group_last = np.append(group_first[1:], len(known_pos)) - 1
+    group_size = group_last - group_first + 1
+    last_tok = known_pos[group_last]
+    second_tok = known_pos[np.maximum(group_last - 1, 0)]
+
+    p = lexicon.polarity[ids[last_tok]].copy()
+    s = lexicon.subjectivity[ids[last_tok]].copy()
+    merged = group_size > 1
+    effective_i = np.where(negated_at[second_tok], 1.0 / lexicon.intensity[ids[second_tok]],
+                           lexicon.intensity[ids[second_tok]])
+    p[merged] = np.clip(p[merged] * effective_i[merged], -1.0, 1.0)
+    s[merged] = np.clip(s[merged] * effective_i[merged], -1.0, 1.0)
+
+    # Negation anywhere in an assessment marks it negated
+    token_group = np.full(len(ids), -1)
+    token_group[known_pos] = group
+    negated = np.zeros(n_groups, dtype=bool)
+    negated[token_group[known_pos[negated_at[known_pos]]]] = True
+    ly_targets = token_group[prev_known[ly_negation]]
+    negated[ly_targets[ly_targets >= 0]] = True
+
+    # Exclamation marks after an assessment's last word boost its polarity
+    bang = exclamation & has_prev_known
+    bang_group = token_group[prev_known[bang]]
+    applies = last_tok[bang_group] == prev_known[bang]
+    boosts = np.bincount(bang_group[applies], minlength=n_groups)
+    p = np.clip(p * 1.25 ** boosts, -1.0, 1.0)
+
+    p = np.where(negated, p * -0.5, p)
+
+    # Average assessments per document
+    group_doc = doc[last_tok]
+    counts = np.bincount(group_doc, minlength=n_docs)
+    divisor = np.maximum(counts, 1)
+    polarity_out = np.bincount(group_doc, weights=p, minlength=n_docs) / divisor
+    subjectivity_out = np.bincount(group_doc, weights=s, minlength=n_docs) / divisor
+    return polarity_out, subjectivity_out
+
+
+def load_sentiment_lexicon(path=COMPILED_LEXICON):
+    """Load the compiled lexicon, compiling it from TextBlob first if it is missing or stale"""
+    try:
+        return PatternLexicon.load(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Compiled sentiment lexicon unavailable ({e}); building from TextBlob")
+
+    lexicon = PatternLexicon.from_textblob()
+    try:
+        lexicon.save(path)
+    except OSError as e:
+        print(f"⚠️  Could not write compiled sentiment lexicon: {e}")
+    return lexicon
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile TextBlob's sentiment lexicon for fast shared loading")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compile_parser = subparsers.add_parser('compile', help="Build the binary lexicon (e.g. during image builds)")
+    compile_parser.add_argument('--output', default=COMPILED_LEXICON, help="Where to write the compiled file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    lexicon = PatternLexicon.from_textblob()
+    lexicon.save(args.output)
+    print(f"✅ Compiled {len(lexicon.words)} entries to {args.output} "
+          f"({os.path.getsize(args.output):,} bytes) in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import contextlib
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HashingFile:
+    """File wrapper that hashes everything written through it"""
+
+    def __init__(self, file):
+        self.file = file
+        self.digest = hashlib.sha256()
+
+    def write(self, data):
+        self.digest.update(data)
+        return self.file.write(data)
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def __iter__(self):
+        return iter(self.file)
+
+
+class TranscriptCache:
+    """On-disk cache of analysis results keyed by audio hash and engine fingerprint.
+
+    Entries live in SQLite; when the stored JSON exceeds max_bytes the least
+    recently used entries are evicted. Hit and miss counts are kept for the
+    life of the process.
+
+    One connection is held open and shared under a lock: opening one per
+    call means the last close checkpoints the WAL, which costs an fsync on
+    every lookup.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # A lost entry only costs a re-transcription, so skip the fsync per commit
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Exclusive use of the shared connection; commits on success"""
+        with self._lock, self._db:
+            yield self._db
+
+    @staticmethod
+    def make_key(audio_hash, fingerprint):
+        return f"{audio_hash}:{fingerprint}"
+
+    def get(self, key):
+        """Return the cached results dict, or None on a miss"""
+        with self._transaction() as db:
+            row = db.execute("SELECT result FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                db.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, key, results):
+        """Store a results dict, then evict least recently used entries over the size bound"""
+        payload = json.dumps(results)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, result, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now)
+            )
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                evict = []
+                for old_key, old_size in db.execute("SELECT key, size FROM entries ORDER BY last_used"):
+                    if total <= self.max_bytes:
+                        break
+                    evict.append((old_key,))
+                    total -= old_size
+                db.executemany("DELETE FROM entries WHERE key = ?", evict)
+
+    def stats(self):
+        """Hit/miss counters plus current entry count and size"""
+        with self._transaction() as db:
+            entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes
+        }
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,83 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import speech_recognition as sr
+
+from audio_processing import split_on_silence
+
+
+class TranscriptionError(Exception):
+    """No segment could be transcribed; message says why"""
+
+
+class ChunkedTranscriber:
+    """Transcribe long recordings as silence-separated segments in parallel.
+
+    Segments go to the recognizer backend through a bounded thread pool
+    (recognition is network-bound, so threads overlap the waiting) and are
+    reassembled in time order. Each segment keeps its start/end offsets,
+    the bytes sent for it and how long its request took.
+    """
+
+    def __init__(self, backend, workers=4, **split_options):
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.split_options = split_options
+
+    def _recognize_segment(self, pcm, start, end):
+        segment = {'start': round(start, 3), 'end': round(end, 3), 'text': ''}
+        usage = {}
+        audio_data = pcm.to_audio_data(start, end)
+        started = time.perf_counter()
+        try:
+            segment['text'] = self.backend.recognize(audio_data, usage=usage)
+        except sr.UnknownValueError:
+            segment['error'] = 'unintelligible'
+        except sr.RequestError as e:
+            segment['error'] = f"request failed: {e}"
+        segment['latency'] = round(time.perf_counter() - started, 3)
+        segment['bytes_sent'] = usage.get('bytes_sent', 0)
+        return segment
+
+    def transcribe(self, pcm, segments=None):
+        """Return (transcript, segment dicts) for a PcmAudio or WavSource.
+
+        Raises TranscriptionError if there was no speech or no segment could
+        be recognized.
+        """
+        if segments is None:
+            segments = split_on_silence(pcm, **self.split_options)
+        if not segments:
+            raise TranscriptionError("No speech detected in the recording.")
+
+        print(f"Transcribing {len(segments)} segments with {min(self.workers, len(segments))} workers...")
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(segments))) as pool:
+            results = list(pool.map(lambda span: self._recognize_segment(pcm, *span), segments))
+
+        transcript = ' '.join(segment['text'] for segment in results if segment['text'])
+        if not transcript:
+            errors = [segment['error'] for segment in results if 'error' in segment]
+            if any(error.startswith('request failed') for error in errors):
+                raise TranscriptionError(f"Speech recognition service error: {errors[-1]}")
+            raise TranscriptionError("Could not understand audio clearly. Please try with a clearer recording.")
+        return transcript, results
+
+
+def failed_requests(segments):
+    """Segments the recognition service gave no answer for (unintelligible audio was answered)"""
+    return [segment for segment in segments if segment.get('error', '').startswith('request failed')]
+
+
+def recognition_summary(segments):
+    """Requests, bytes on the wire and request latency for one job's segments"""
+    latencies = np.array([segment.get('latency', 0.0) for segment in segments], dtype=float)
+    bytes_sent = sum(segment.get('bytes_sent', 0) for segment in segments)
+    audio_seconds = sum(segment['end'] - segment['start'] for segment in segments)
+    return {
+        'requests': len(segments),
+        'bytes_sent': bytes_sent,
+        'bytes_per_audio_second': round(float(bytes_sent / audio_seconds), 1) if audio_seconds else 0.0,
+        'latency_mean': round(float(latencies.mean()), 3) if len(latencies) else 0.0,
+        'latency_p95': round(float(np.percentile(latencies, 95)), 3) if len(latencies) else 0.0,
+        'latency_max': round(float(latencies.max()), 3) if len(latencies) else 0.0
+    }
@@ -0,0 +1,81 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from lecturer_sentiment_analyzer import SentimentEngine, AnalysisResult
+
+# Engine owned by each worker process, built once by the pool initializer
+_worker_engine = None
+
+
+def _init_worker(engine_kwargs):
+    """Build the worker's engine up front: stopwords, filler automaton, mmap'd lexicon"""
+    global _worker_engine
+    # Workers only score text, so skip the recognizer, transcriber and decoder
+    _worker_engine = SentimentEngine(text_only=True, **engine_kwargs)
+
+
+def _warm_up(hold_seconds):
+    """Report the worker pid; holding briefly spreads warm-up tasks over all workers"""
+    time.sleep(hold_seconds)
+    return os.getpid()
+
+
+def _analyze_text(text, duration_seconds, voiced_seconds):
+    """Worker entry point: text in, plain results dict out"""
+    return dict(_worker_engine.analyze_text(text, duration_seconds, voiced_seconds))
+
+
+class AnalysisPool:
+    """Process pool for the CPU-bound text stages (tokenizing, scoring, metrics, feedback).
+
+    Only the transcript string goes to a worker and only the plain results
+    dict comes back, so no TextBlob or engine objects are pickled. Every
+    worker holds its own SentimentEngine; the compiled lexicon's arrays are
+    memory-mapped, so the workers share those pages (each still builds its
+    own word vocabulary).
+    """
+
+    def __init__(self, processes=None, engine_kwargs=None, fallback_engine=None, timeout=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.engine_kwargs = dict(engine_kwargs or {})
+        self.fallback_engine = fallback_engine
+        self.timeout = timeout
+
+        # Fork workers now, while the server is still single-threaded
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else:
+            context = multiprocessing.get_context()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.engine_kwargs,)
+        )
+
+    def warm_up(self):
+        """Start every worker and wait until each has built its engine"""
+        futures = [self.executor.submit(_warm_up, 0.05) for _ in range(self.processes)]
+        pids = {future.result() for future in futures}
+        print(f"✅ Analysis pool ready ({len(pids)} worker processes)")
+        return pids
+
+    def analyze_text(self, text, duration_seconds=None, voiced_seconds=None):
+        """Run SentimentEngine.analyze_text in a worker and return an AnalysisResult"""
+        try:
+            payload = self.executor.submit(_analyze_text, text, duration_seconds, voiced_seconds).result(self.timeout)
+        except BrokenProcessPool as e:
+            if self.fallback_engine is None:
+                raise
+            print(f"⚠️  Analysis pool unavailable ({e}); analyzing in-process")
+            return self.fallback_engine.analyze_text(text, duration_seconds, voiced_seconds)
+
+        results = AnalysisResult()
+        results.update(payload)
+        return results
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)